@@ -1,13 +1,19 @@
 from __future__ import annotations
 
 from baywatch.bay import Bay
-from baywatch.config_control import ConfigUpdateForm, Configuration
-from baywatch.version import __version__
+from baywatch.async_bay import AsyncBay
+from baywatch.cache import CACHE_DIR, write_atomic
+from baywatch.prefetch import Prefetcher
+from baywatch.transmission import AsyncTransmission, TransferMonitor, STATUS_NAMES
+from baywatch.results import ResultTable, SORT_KEYS, filesize_readable, parse_filters
+from baywatch.config_control import Configuration
+from baywatch.timing import Timings
+from baywatch.profiling import Profiler
 
 import rich
 from rich.panel import Panel
 from rich.align import Align
-from rich.console import RenderableType
+from rich.console import RenderableType, Group
 from rich.text import Text
 from rich.table import Table
 
@@ -17,75 +23,244 @@ from textual.widgets import ButtonPressed, Footer
 from textual.widget import Widget, Reactive
 from textual.message import Message
 from textual_inputs import TextInput
-from ck_widgets.widgets import ListViewUo
 
-from pyfiglet import Figlet
-import subprocess
-from transmission_rpc import Client as Transmission
-import pyperclip
 import asyncio
 import os
-import argparse
+import time
+import hashlib
+from datetime import timedelta
+from collections import deque
+from functools import lru_cache
+from typing import Awaitable
 
 
 MIRROR_SIDEBAR_SIZE = 35
+STATS_SIDEBAR_SIZE = 50
+STATS_REFRESH_INTERVAL = 1
 FILE_SIDEBAR_SIZE = 80
+TRANSFER_SIDEBAR_SIZE = 80
+RESULT_HEIGHT = 4
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), 'data/conf.json')
+CONFIG_RELOAD_INTERVAL = 2
+TITLE_FONT = 'shadow'
+
+
+@lru_cache(maxsize=None)
+def render_title(text: str, font: str = TITLE_FONT, cache_dir: str | None = None) -> str:
+    """Render figlet title once per process; with 'cache_dir' also across runs, so pyfiglet is only imported on a miss."""
+
+    path = None
+    if cache_dir is not None:
+        path = os.path.join(cache_dir, 'title-{}-{}.txt'.format(font, hashlib.sha1(text.encode()).hexdigest()[:12]))
+        try:
+            with open(path, 'r') as f:
+                return f.read()
+        except OSError:
+            pass
+
+    from pyfiglet import Figlet
+    title = Figlet(font).renderText(text)
+    if path is not None:
+        try:
+            write_atomic(path, title)
+        except OSError:
+            pass
+    return title
 
 
 class TitleWidget(Widget, can_focus=True):
     """Widget displays title on open"""
 
-    def __init__(self, *, name: str | None = None, height: int | None = None) -> None:
+    def __init__(self, *, name: str | None = None, height: int | None = None, cache_dir: str | None = None, launch_time: float | None = None) -> None:
         super().__init__(name=name)
         self.height = height
+        self.cache_dir = cache_dir
+        self.launch_time = launch_time
 
     def __rich_repr__(self) -> rich.repr.Result:
         yield "name", self.name
 
+    def render_lines(self) -> None:
+        super().render_lines()
+        # the title is the first thing painted on launch
+        if self.launch_time is not None:
+            self.log('first frame after {0:.3f} sec'.format(time.perf_counter() - self.launch_time))
+            self.launch_time = None
+
     def render(self) -> RenderableType:
         return Align(
             f"[magenta]{self.generate_title()}[/]", vertical='middle', align='center', pad=False
         )
 
-    def generate_title(self, figlet_font: str = 'shadow') -> None:
+    def generate_title(self, figlet_font: str = TITLE_FONT) -> Text:
         return Text(
-            Figlet(figlet_font).renderText('{}'.format(self.name)),
+            render_title('{}'.format(self.name), figlet_font, self.cache_dir),
             no_wrap=True,
             overflow='crop',
         )
 
 
-class SearchResult(Widget, can_focus=True):
-    """Search result item; handles key press actions on focus"""
+class ResultList(Widget, can_focus=True):
+    """Virtualized search result list; renders only rows on screen and tracks selection as an integer cursor
+
+    Results live in a columnar ResultTable; 'order' holds row indices in arrival order and 'results' is the view
+    after filters and sort are applied, so re-sorting or filtering never touches the network.
+    """
 
     has_focus: Reactive[bool] = Reactive(False)
+    cursor: Reactive[int] = Reactive(0)
 
-    def __init__(self, *, data: dict | None = None, idx: int | None = None, name: str | None = None, height: int | None = None) -> None:
+    def __init__(self, *, results: list | None = None, name: str | None = None, timings: Timings | None = None) -> None:
         super().__init__(name=name)
-        self.height = height
-        self.data = data
-        self.idx = idx
+        self.timings = timings or Timings(None)
+        self.table = ResultTable(results or [])
+        self.order = list(range(len(self.table)))
+        self.filters = {}
+        self.sort_key = None
+        self.results = self.table.take(self.order)
+        self.offset = 0
+        self.key = None
+        self.search_started = None
+        self.search_phase = 'search'
+        self.render_times = deque(maxlen=100)
+        self.merged = len(self.order)
+        self.marked = {}
 
     def __rich_repr__(self) -> rich.repr.Result:
         yield "name", self.name
+        yield "results", len(self.results)
+        yield "cursor", self.cursor
         yield "has_focus", self.has_focus, False
 
+    @property
+    def data(self) -> dict | None:
+        """Result under cursor"""
+        return self.results[self.cursor] if len(self.results) > 0 else None
+
+    @property
+    def idx(self) -> int:
+        return self.cursor
+
+    @property
+    def page_size(self) -> int:
+        return max(1, self.size.height // RESULT_HEIGHT)
+
+    def validate_cursor(self, value: int) -> int:
+        return max(0, min(value, len(self.results) - 1))
+
+    async def watch_cursor(self, value: int) -> None:
+        if self.has_focus:
+            self.key = 'focus'
+            await self.emit(ButtonPressed(self))
+
+    def update(self, results: list, search_started: float | None = None, provisional: bool = False) -> None:
+        """Swap in new results without relayout; 'search_started' times search-to-paint
+
+        Provisional (local index) results stay below network results merged in later; their paint is timed as the
+        'local' phase so it does not count as the search's.
+        """
+
+        self.table = ResultTable(results)
+        self.order = list(range(len(self.table)))
+        self.merged = 0 if provisional else len(self.order)
+        self.offset = 0
+        self.cursor = 0
+        self.search_started = search_started
+        self.search_phase = 'local' if provisional else 'search'
+        self.apply_view()
+
+    def merge(self, results: list, search_started: float | None = None) -> None:
+        """Add streamed results ahead of provisional ones, dropping provisional duplicates; repaint is coalesced until idle
+
+        Pass 'search_started' with the first network results merged over provisional ones to time search-to-paint.
+        """
+
+        if search_started is not None:
+            self.search_started = search_started
+            self.search_phase = 'search'
+
+        confirmed = set(self.order[:self.merged])
+        added = [i for i in dict.fromkeys(self.table.extend(results)) if i not in confirmed]
+        provisional = [i for i in self.order[self.merged:] if i not in added]
+        self.order[self.merged:] = added + provisional
+        self.merged += len(added)
+        self.apply_view()
+
+    def set_view(self, filters: dict | None = None, sort_key: str | None = None) -> None:
+        """Change filters and sort order of the current results"""
+
+        if filters is not None: self.filters = filters
+        self.sort_key = sort_key
+        self.cursor = 0
+        self.apply_view()
+
+    def apply_view(self) -> None:
+        with self.timings.span('view'):
+            indices = self.table.filter(self.order, **self.filters)
+            if self.sort_key is not None: indices = self.table.sort(indices, self.sort_key)
+            self.results = self.table.take(indices)
+        # re-clamp cursor to the new view
+        self.cursor = self.cursor
+        self.refresh()
+
+    def toggle_mark(self) -> None:
+        """Add or remove result under cursor from the multi-selection"""
+
+        if self.data is None: return None
+        if self.data['info_hash'] in self.marked:
+            del self.marked[self.data['info_hash']]
+        else:
+            self.marked[self.data['info_hash']] = self.data
+        self.refresh()
+
+    def take_marked(self) -> list:
+        """Return marked results (or the result under cursor if none) and clear the selection"""
+
+        marked = list(self.marked.values()) if len(self.marked) > 0 else [self.data]
+        self.marked = {}
+        self.refresh()
+        return marked
+
+    def render_lines(self) -> None:
+        render_started = time.perf_counter()
+        super().render_lines()
+        painted = time.perf_counter()
+        self.timings.record('paint', painted - render_started)
+        if self.search_started is not None:
+            self.timings.record(self.search_phase, painted - self.search_started)
+            if self.search_phase == 'search':
+                self.render_times.append((painted - self.search_started, painted - render_started))
+                self.log('{} results painted {:.3f} sec after search (render {:.3f} sec)'.format(len(self.results), *self.render_times[-1]))
+            else:
+                self.log('{} {} results painted {:.3f} sec after submit'.format(len(self.results), self.search_phase, painted - self.search_started))
+            self.search_started = None
+
     def render(self) -> RenderableType:
-        if self.data is None: return self.render_empty()
+        if len(self.results) == 0: return self.render_empty()
+        if self.cursor < self.offset:
+            self.offset = self.cursor
+        elif self.cursor >= self.offset + self.page_size:
+            self.offset = self.cursor - self.page_size + 1
+        self.offset = max(0, min(self.offset, len(self.results) - self.page_size))
+        window = self.results[self.offset:self.offset + self.page_size]
+        return Group(*[self.render_result(r, self.has_focus and i == self.cursor, r['info_hash'] in self.marked) for i, r in enumerate(window, self.offset)])
+
+    def render_result(self, data: dict, selected: bool, marked: bool = False) -> RenderableType:
         return Panel(
-            Text.assemble((self.data['name'], "bold white"), "\n", (self.data['magnet'], 'cyan'), no_wrap=True, overflow='ellipsis'),
-            title=f"[blue]{self.data['category_name']}[/]",
+            Text.assemble((data['name'], "bold white"), "\n", (data['magnet'], 'cyan'), no_wrap=True, overflow='ellipsis'),
+            title=f"{'[green]+[/] ' if marked else ''}[blue]{data['category_name']}[/]",
             title_align="left",
-            border_style="magenta" if not self.has_focus else "yellow",
-            subtitle=f"[blue]{self.data['num_files']} file{'s' if int(self.data['num_files']) > 1 else ''}[/] | [blue]{self.data['size']}[/] | [green]{self.data['seeders']}[/] | [red]{self.data['leechers']}[/]",
+            border_style="yellow" if selected else "green" if marked else "magenta",
+            subtitle=f"[blue]{data['num_files']} file{'s' if int(data['num_files']) > 1 else ''}[/] | [blue]{data['size']}[/] | [green]{data['seeders']}[/] | [red]{data['leechers']}[/]",
             subtitle_align="right",
+            height=RESULT_HEIGHT,
         )
 
     def render_empty(self) -> RenderableType:
         return Panel(
             f"[bold red]No results[/]",
             border_style="red",
+            height=RESULT_HEIGHT,
         )
 
     async def on_focus(self, event: events.Focus) -> None:
@@ -96,29 +271,59 @@ class SearchResult(Widget, can_focus=True):
     async def on_blur(self, event: events.Blur) -> None:
         self.has_focus = False
 
+    async def on_mouse_scroll_down(self, event: events.MouseScrollDown) -> None:
+        self.cursor += 1
+
+    async def on_mouse_scroll_up(self, event: events.MouseScrollUp) -> None:
+        self.cursor -= 1
+
     async def on_key(self, event: events.Key) -> None:
         self.key = event.key
-        if event.key == 'f':
+        if self.data is None: return None
+        if event.key in ('f', 'p', 'd'):
             event.prevent_default().stop()
             await self.emit(ButtonPressed(self))
-        elif event.key == 'p':
+        elif event.key == 'c':
+            import pyperclip
+            pyperclip.copy(self.data['magnet'])
+        elif event.key == ' ':
             event.prevent_default().stop()
-            await self.emit(ButtonPressed(self))
-        elif event.key == 'd':
+            self.toggle_mark()
+            self.cursor += 1
+        elif event.key == 's':
             event.prevent_default().stop()
+            keys = (None,) + SORT_KEYS
+            self.set_view(sort_key=keys[(keys.index(self.sort_key) + 1) % len(keys)])
             await self.emit(ButtonPressed(self))
-        elif event.key == 'c':
-            pyperclip.copy(self.data['magnet'])
+        elif event.key in ('down', 'j'):
+            event.prevent_default().stop()
+            self.cursor += 1
+        elif event.key in ('up', 'k'):
+            event.prevent_default().stop()
+            self.cursor -= 1
+        elif event.key == 'pagedown':
+            event.prevent_default().stop()
+            self.cursor += self.page_size
+        elif event.key == 'pageup':
+            event.prevent_default().stop()
+            self.cursor -= self.page_size
+        elif event.key == 'home':
+            event.prevent_default().stop()
+            self.cursor = 0
+        elif event.key == 'end':
+            event.prevent_default().stop()
+            self.cursor = len(self.results) - 1
 
 
 class MirrorSidebar(Widget):
     """Display site mirror connection and response time"""
 
-    def __init__(self, *, client: Bay | None = None, name: str | None = None, height: int | None = None) -> None:
+    def __init__(self, *, client: AsyncBay | None = None, name: str | None = None, height: int | None = None) -> None:
         super().__init__(name=name)
         self.height = height
         self.client = client
         self.response_time = None
+        self.updating = False
         self.footer = self.build_footer()
 
     def build_footer(self) -> Text:
@@ -140,6 +345,7 @@ class MirrorSidebar(Widget):
         return footer
 
     def render(self) -> RenderableType:
+        if not self.client.ready.is_set() or self.updating: return self.render_connecting()
         return Panel(
             Align.center(
                 f"[magenta]{self.client.mirror}[/]\n[blue]{self.response_time} sec[/]", vertical='middle'
@@ -149,14 +355,55 @@ class MirrorSidebar(Widget):
             subtitle=self.footer,
         )
 
-    def get_response_time(self) -> None:
-        self.response_time = self.client.get_active_mirror_response()
+    def render_connecting(self) -> RenderableType:
+        return Panel(
+            Align.center(
+                f"[yellow]connecting...[/]\n[magenta]{self.client.mirror or ''}[/]", vertical='middle'
+            ),
+            title=f"[bold blue]Mirror[/]",
+            border_style="yellow",
+            subtitle=self.footer,
+        )
+
+    async def get_response_time(self) -> None:
+        if not self.client.ready.is_set(): return None
+        self.response_time = await self.client.get_active_mirror_response()
+        self.refresh()
+
+    async def update_mirror(self) -> str:
+        self.updating = True
+        self.refresh()
+        try:
+            await self.client.update_mirror()
+        finally:
+            self.updating = False
+        await self.get_response_time()
+        return self.client.mirror
+
+class StatsSidebar(Widget):
+    """Display percentiles of request and UI phase timings"""
+
+    def __init__(self, *, timings: Timings | None = None, name: str | None = None, height: int | None = None) -> None:
+        super().__init__(name=name)
+        self.height = height
+        self.timings = timings
 
-    async def update_mirror(self) -> Bay:
-        with self.console.status('Getting mirrors'):
-            self.client.update_mirror()
-            self.get_response_time()
-        return self.client
+    def render(self) -> RenderableType:
+        summary = self.timings.summary()
+        if len(summary) == 0:
+            return Panel(Align.center("[yellow]no timings yet[/]", vertical='middle'), title="[bold blue]Timings[/]", border_style="blue")
+        table = Table(expand=True, box=None, header_style="bold blue")
+        table.add_column("phase", style="magenta")
+        for column in ('n', 'p50', 'p95', 'p99', 'max'):
+            table.add_column(column, justify="right")
+        for phase, stats in summary.items():
+            table.add_row(
+                phase,
+                str(stats['count']),
+                *['{:.1f}'.format(stats[k] * 1000) for k in ('p50', 'p95', 'p99', 'max')],
+                style='red' if stats['p95'] > 1 else None,
+            )
+        return Panel(table, title="[bold blue]Timings (ms)[/]", border_style="blue")
 
 class FilesSidebar(Widget):
     """Display details of search result item"""
@@ -209,26 +456,104 @@ class FilesSidebar(Widget):
         return table
 
 
+class TransfersSidebar(Widget):
+    """Display Transmission progress, rates and ETA"""
+
+    def __init__(self, *, monitor: TransferMonitor, name: str | None = None, height: int | None = None) -> None:
+        super().__init__(name=name)
+        self.height = height
+        self.monitor = monitor
+
+    def render(self) -> RenderableType:
+        if not self.monitor.synced: return self.render_status()
+        torrents = self.monitor.torrents.values()
+        down = sum(t['rateDownload'] for t in torrents)
+        up = sum(t['rateUpload'] for t in torrents)
+        return Panel(
+            self.build_table(),
+            border_style="blue",
+            title='Transfers',
+            subtitle=f"{len(torrents)} torrents | [green]{filesize_readable(down, 'B/s')}[/] | [red]{filesize_readable(up, 'B/s')}[/]",
+            subtitle_align='right',
+        )
+
+    def render_status(self) -> RenderableType:
+        status = '[yellow]connecting...[/]' if self.monitor.error is None else '[red]Transmission not available[/]'
+        return Panel(
+            Align(status, vertical='middle', align='center'),
+            title='Transfers',
+            border_style="yellow" if self.monitor.error is None else "red",
+        )
+
+    def build_table(self) -> Table:
+        table = Table('[blue]Name', '[blue]Status', '[blue]Done', '[blue]Down', '[blue]Up', '[blue]ETA', box=None, min_width=TRANSFER_SIDEBAR_SIZE - 4)
+        # transferring first; only rows that fit are rendered
+        torrents = sorted(self.monitor.torrents.values(), key=lambda t: (-(t['rateDownload'] + t['rateUpload']), t['name']))
+        for t in torrents[:max(0, self.size.height - 3)]:
+            table.add_row(
+                Text(t['name'], no_wrap=True, overflow='ellipsis'),
+                STATUS_NAMES.get(t['status'], ''),
+                '{:.0%}'.format(t['percentDone']),
+                filesize_readable(t['rateDownload'], 'B/s'),
+                filesize_readable(t['rateUpload'], 'B/s'),
+                str(timedelta(seconds=t['eta'])) if t['eta'] >= 0 else '',
+                style='white' if t['rateDownload'] + t['rateUpload'] > 0 else 'bright_black',
+            )
+        return table
+
+
 class Baywatch(App):
     """Main app"""
 
-    def __init__(self, *args, **kwargs) -> None:
+    def __init__(self, *args, profiler: Profiler | None = None, launch_time: float | None = None, **kwargs) -> None:
+        # started first so startup stalls are caught too
+        if profiler is not None: profiler.start()
         super().__init__(*args, **kwargs)
+        self.launch_time = launch_time if launch_time is not None else time.perf_counter()
+        self.profiler = profiler
         self.config = Configuration(CONFIG_PATH)
-        self.client = Bay(self.config.data.mirror, user_agent=self.config.data.user_agent.format(__version__))
+        self.client = Bay.from_config(self.config.data, lazy=True)
+        self.async_client = AsyncBay(self.client)
+        self.client_ready = None
+        self.live_search = self.config.data.live_search or {}
+        self.debounce_task = None
+        self.search_task = None
+        self.search_query = None
+        self.files_task = None
         self.display_title = 'baywatch'
-        self.transmission_client = None
+        # mirror last saved to or loaded from the configuration, to tell failovers from edits
+        self.saved_mirror = self.config.data.mirror
+        transmission = self.config.data.transmission
+        self.transmission_client = AsyncTransmission(
+            username=transmission['username'],
+            password=transmission['password'],
+            host=transmission['host'],
+            port=transmission['port'],
+            command=transmission['command'],
+            try_open=transmission['try_open'],
+        )
+        self.transfers_monitor = TransferMonitor(
+            self.transmission_client,
+            min_interval=float(transmission.get('poll_min_interval', 1)),
+            max_interval=float(transmission.get('poll_max_interval', 10)),
+        )
+        self.download_task = None
+        self.transfers_task = None
 
     async def on_load(self, event: events.Load) -> None:
         """Register keybindings + dummy keybindings for widget events"""
 
         await self.bind("enter", "submit", "Search")
         await self.bind("m", "toggle_mirror_sidebar", "Mirror info")
+        await self.bind("i", "toggle_stats_sidebar", "Stats")
         await self.bind("f", "toggle_files_sidebar", "Files info")
         await self.bind("r", "refresh_mirror", "Refresh mirror", show=False)
         await self.bind("p", "pass", "Play")
         await self.bind("d", "pass", "Download")
+        await self.bind(" ", "pass", "Select", key_display="space")
+        await self.bind("s", "pass", "Sort")
         await self.bind("c", "copy_link", "Copy link")
+        await self.bind("t", "toggle_transfers_sidebar", "Transfers")
         await self.bind("q", "quit", "Quit")
         await self.bind("ctrl+q", "quit", show=False)
 
@@ -237,7 +562,9 @@ class Baywatch(App):
         await self.bind("shift+tab", "previous_tab_index", show=False)
 
     show_mirror_bar = Reactive(False)
+    show_stats_bar = Reactive(False)
     show_files_bar = Reactive(False)
+    show_transfers_bar = Reactive(False)
 
     async def on_mount(self, event: events.Mount) -> None:
         """Initialize widgets"""
@@ -250,97 +577,217 @@ class Baywatch(App):
         self.footer = Footer()
         await self.view.dock(self.footer, edge="bottom")
 
-        self.mirror_sidebar = MirrorSidebar(name="mirror", client=self.client)
+        self.mirror_sidebar = MirrorSidebar(name="mirror", client=self.async_client)
         await self.view.dock(self.mirror_sidebar, edge="left", size=MIRROR_SIDEBAR_SIZE, z=1)
         self.mirror_sidebar.layout_offset_x = -MIRROR_SIDEBAR_SIZE
 
+        self.stats_sidebar = StatsSidebar(name="stats", timings=self.client.timings)
+        # own layer, so it is not laid out beside the mirror sidebar and hides fully off screen
+        await self.view.dock(self.stats_sidebar, edge="left", size=STATS_SIDEBAR_SIZE, z=4)
+        self.stats_sidebar.layout_offset_x = -STATS_SIDEBAR_SIZE
+
         self.files_sidebar = FilesSidebar(name="files")
         await self.view.dock(self.files_sidebar, edge="right", size=FILE_SIDEBAR_SIZE, z=2)
         self.files_sidebar.layout_offset_x = FILE_SIDEBAR_SIZE
 
+        self.transfers_sidebar = TransfersSidebar(name="transfers", monitor=self.transfers_monitor)
+        await self.view.dock(self.transfers_sidebar, edge="right", size=TRANSFER_SIDEBAR_SIZE, z=3)
+        self.transfers_sidebar.layout_offset_x = TRANSFER_SIDEBAR_SIZE
+
         await self.view.dock(self.search_bar, edge='top', size=4)
 
-        self.title_text = TitleWidget(name=self.display_title)
+        # title and results share the main region; only one is visible at a time
+        title_cache = (self.config.data.cache or {}).get('title', True)
+        self.title_text = TitleWidget(name=self.display_title, cache_dir=CACHE_DIR if title_cache else None, launch_time=self.launch_time)
         await self.view.dock(self.title_text)
+        self.search_results = ResultList(name="search_results", timings=self.client.timings)
+        self.search_results.visible = False
+        await self.view.dock(self.search_results)
 
         self.tab_index = ['search_bar', 'title_text']
         self.current_index = -1
 
-    async def action_submit(self) -> None:
-        """Search bar submit"""
+        self.prefetcher = Prefetcher(self.async_client)
+        self.resolve_client()
+        self.set_interval(CONFIG_RELOAD_INTERVAL, self.reload_config)
+        self.set_interval(STATS_REFRESH_INTERVAL, self.refresh_stats)
+
+    async def reload_config(self) -> None:
+        """Pick up changes saved from the configuration editor while running"""
+
+        if not self.config.reload(): return None
+        self.live_search = self.config.data.live_search or {}
+        if self.config.data.mirror != self.saved_mirror:
+            self.saved_mirror = self.config.data.mirror
+            self.client.mirror = self.saved_mirror
+            self.mirror_sidebar.refresh()
+            self.log('mirror changed to {}'.format(self.saved_mirror))
+        self.log('configuration reloaded')
 
-        with self.console.status("Searching"):
-            #search
-            search_term = self.search_bar.value
+    async def refresh_stats(self) -> None:
+        if self.show_stats_bar: self.stats_sidebar.refresh()
+
+    def resolve_client(self) -> None:
+        """Select a mirror in the background; searches wait on this until it finishes"""
+
+        self.client_ready = asyncio.ensure_future(self.async_client.resolve_mirror())
+        self.client_ready.add_done_callback(self.on_client_ready)
+
+    def on_client_ready(self, future: asyncio.Future) -> None:
+        """Log mirror selection and repaint mirror sidebar once background bootstrap finishes"""
+
+        if future.cancelled(): return None
+        if future.exception() is not None:
+            self.log('unable to connect to a mirror: {}'.format(future.exception()))
+        else:
+            self.log('connected to {} after {:.3f} sec'.format(future.result(), time.perf_counter() - self.launch_time))
+        self.mirror_sidebar.refresh()
+
+    async def wait_for_client(self) -> bool:
+        """Wait for background mirror selection if it has not finished yet, retrying it if it failed"""
+
+        if self.client_ready is not None and self.client_ready.done() and (self.client_ready.cancelled() or self.client_ready.exception() is not None):
+            # a failed bootstrap is not final: mirrors that were down at launch may be back
+            self.resolve_client()
+        if self.client_ready is not None and not self.client_ready.done():
+            await asyncio.wait([self.client_ready])
+        if self.client_ready is not None and (self.client_ready.cancelled() or self.client_ready.exception() is not None): return False
+        return self.client.ready.is_set() and self.client.mirror is not None
+
+    def run_in_background(self, coroutine: Awaitable) -> asyncio.Task:
+        """Schedule coroutine off the message loop; exceptions are logged instead of lost"""
+
+        task = asyncio.ensure_future(coroutine)
+        task.add_done_callback(self.log_task_exception)
+        return task
+
+    def log_task_exception(self, task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            self.log('background task failed: {!r}'.format(task.exception()))
+
+    async def action_submit(self) -> None:
+        """Search bar submit; supersedes any search still in flight"""
+
+        if self.debounce_task is not None: self.debounce_task.cancel()
+        self.start_search(self.search_bar.value)
+
+    async def handle_input_on_change(self, message: Message) -> None:
+        """Search as you type once typing pauses"""
+
+        if message.sender.name != 'search_bar' or not self.live_search.get('enabled', True): return None
+        if self.debounce_task is not None: self.debounce_task.cancel()
+        self.debounce_task = self.run_in_background(self.debounce_search(self.search_bar.value))
+
+    async def debounce_search(self, search_term: str) -> None:
+        await asyncio.sleep(float(self.live_search.get('debounce', 0.3)))
+        if len(search_term.strip()) < int(self.live_search.get('min_length', 3)): return None
+        self.start_search(search_term)
+
+    def start_search(self, search_term: str) -> None:
+        """Apply filter terms to shown results at once; cancel the search in flight unless it is for the same query"""
+
+        search_term, filters = parse_filters(search_term, self.client.category_index.ids)
+        refilter = filters != self.search_results.filters
+        if refilter: self.search_results.set_view(filters=filters, sort_key=self.search_results.sort_key)
+        if len(search_term) == 0: return None
+        if self.search_task is not None and not self.search_task.done():
+            if search_term == self.search_query: return None
+            self.search_task.cancel()
+        # only filter terms changed; results already shown cover the query
+        elif refilter and search_term == self.search_query: return None
+        self.search_query = search_term
+        self.search_task = self.run_in_background(self.run_search(search_term))
+
+    async def run_search(self, search_term: str) -> None:
+        """Search off the message loop and show results"""
+
+        # drop prefetches for previous results
+        self.prefetcher.cancel_all()
+
+        search_started = time.perf_counter()
+        local = []
+        await self.set_search_status('Searching')
+        try:
+            # previously seen matches show instantly, and are all there is offline
+            local = await self.async_client.local_search(search_term)
+            if len(local) > 0:
+                self.log('{} local results for "{}" after {:.3f} sec'.format(len(local), search_term, time.perf_counter() - search_started))
+                self.show_results(local, search_started, provisional=True)
+            if not await self.wait_for_client():
+                self.log(f'unable to search "{search_term}": no mirror available')
+                await self.set_search_status('Offline' if len(local) > 0 else 'No mirror available')
+                return None
             self.log(f'searching "{search_term}"')
-            results = self.client.search(search_term)
-            self.log(f'{len(results)} found for "{search_term}"')
+            count = 0
+            async for results in self.async_client.search_stream(search_term):
+                if count == 0:
+                    self.log('first result for "{}" after {:.3f} sec'.format(search_term, time.perf_counter() - search_started))
+                    if len(local) == 0: self.show_results(results, search_started)
+                    else: self.search_results.merge(results, search_started)
+                else:
+                    self.search_results.merge(results)
+                count += len(results)
+        except asyncio.CancelledError:
+            self.log(f'search for "{search_term}" superseded')
+            raise
+        except Exception as e:
+            self.log(f'search for "{search_term}" failed: {e!r}')
+            await self.set_search_status('Offline' if len(local) > 0 else 'Search failed')
+            return None
+        if count == 0 and len(local) == 0: self.show_results([], search_started)
+        self.log(f'{count} found for "{search_term}"')
+        self.log(f'cache {self.client.cache_stats()}')
+        self.log('timings (p50/p95 ms) {}'.format(', '.join('{} {:.1f}/{:.1f}'.format(phase, t['p50'] * 1000, t['p95'] * 1000) for phase, t in self.client.timings.summary().items())))
+        if self.client.hedge: self.log(f'hedging {self.client.hedge_report()}')
+        if self.client.mirror != self.saved_mirror:
+            self.log('failed over to {}'.format(self.client.mirror))
+            self.saved_mirror = self.client.mirror
+            self.config.add('mirror', self.client.mirror)
+            self.mirror_sidebar.refresh()
+        await self.set_search_status(None)
+
+    def show_results(self, results: list, search_started: float | None = None, provisional: bool = False) -> None:
+        """Swap results into the already-mounted list"""
 
-            # build search results
-            self.search_results = ListViewUo([SearchResult(data=r, idx=i) for i, r in enumerate(results)])
+        self.search_results.update(results, search_started=search_started, provisional=provisional)
+        if self.title_text.visible:
+            self.title_text.visible = False
+            self.search_results.visible = True
 
-            # clear widgets
-            self.view.layout.docks.clear()
-            self.view.widgets.clear()
+        # build tab index
+        self.build_tab_index()
 
-            # re-add widgets
-            await self.view.dock(self.mirror_sidebar, edge="left", size=MIRROR_SIDEBAR_SIZE, z=1)
-            await self.view.dock(self.files_sidebar, edge="right", size=FILE_SIDEBAR_SIZE, z=2)
-            await self.view.dock(self.search_bar, edge='top', size=4)
-            await self.view.dock(self.footer, edge="bottom")
-            await self.view.dock(self.search_results)
+    async def set_search_status(self, status: str | None) -> None:
+        """Show search progress in search bar title"""
 
-            # build tab index
-            self.build_tab_index()
+        self.search_bar.title = 'Search' if status is None else 'Search [yellow]({})[/]'.format(status)
+        self.search_bar.refresh()
 
     def build_tab_index(self) -> None:
-        """Tab-index search bar and search result widgets"""
+        """Tab-index search bar; search results follow it as integer positions"""
 
-        tab_index = ['search_bar']
-        if hasattr(self, 'search_results'):
-            tab_index += ['search_results[{}]'.format(i) for i in range(len(self.search_results.widgets_list))]
-        self.tab_index = tab_index
+        self.tab_index = ['search_bar']
         self.current_index = 0
 
-    async def add_transmission_client(self) -> bool:
-        """Set-up transmission connection"""
+    @property
+    def tab_count(self) -> int:
+        """Number of tab stops: named widgets followed by each search result"""
 
-        try:
-            self.transmission_client = Transmission(
-                username=self.config.data.transmission['username'],
-                password=self.config.data.transmission['password'],
-                host=self.config.data.transmission['host'],
-                port=self.config.data.transmission['port'],
-            )
-            return True
-        except Exception as e:
-            self.log(e)
-            if self.config.data.transmission['try_open']:
-                self.log('trying to open {}'.format(self.config.data.transmission['command']))
-                try:
-                    subprocess.run('{} >/dev/null 2>&1 &'.format(self.config.data.transmission['command']), shell=True)
-                    await asyncio.sleep(1)
-                    self.transmission_client = Transmission(
-                        username=self.config.data.transmission['username'],
-                        password=self.config.data.transmission['password'],
-                        host=self.config.data.transmission['host'],
-                        port=self.config.data.transmission['port'],
-                    )
-                    return True
-                except Exception as e:
-                    self.log('could not open {}'.format(self.config.data.transmission['command']))
-                    self.log(e)
-                    return False
-            else:
-                return False
+        return len(self.tab_index) + len(self.search_results.results)
 
     async def action_refresh_mirror(self) -> None:
         """Get fastest available mirror"""
 
-        if self.show_mirror_bar:
-            self.client = await self.mirror_sidebar.update_mirror()
-            self.config.add('mirror', self.client.mirror)
-            self.log('mirror updated to {}'.format(self.client.mirror))
+        if self.show_mirror_bar and not self.mirror_sidebar.updating:
+            self.run_in_background(self.refresh_mirror())
+
+    async def refresh_mirror(self) -> None:
+        mirror = await self.mirror_sidebar.update_mirror()
+        # a working mirror supersedes a failed bootstrap
+        if self.client_ready is not None and self.client_ready.done(): self.client_ready = None
+        self.saved_mirror = mirror
+        self.config.add('mirror', mirror)
+        self.log('mirror updated to {}'.format(mirror))
 
     async def action_pass(self) -> None:
         """Dummy action to render widget key events in footer"""
@@ -350,7 +797,7 @@ class Baywatch(App):
     async def action_copy_link(self) -> None:
         """Copy result link to clipboard"""
 
-        if type(self.focused) == SearchResult:
+        if type(self.focused) == ResultList:
             await self.highlight_footer_key('c')
 
     async def highlight_footer_key(self, key: str) -> None:
@@ -367,7 +814,7 @@ class Baywatch(App):
         """Receive events from widgets"""
 
         # Play on 'p'
-        if message.sender.key == 'p' and isinstance(message.sender, SearchResult):
+        if message.sender.key == 'p' and isinstance(message.sender, ResultList):
             self.log(f"playing {message.sender.data['id']}: {message.sender.data['name']}")
             command = self.config.data.play_multifile if int(message.sender.data['num_files']) > 1 else self.config.data.command
             if '{}' not in command:
@@ -375,35 +822,51 @@ class Baywatch(App):
             await self.shutdown_and_run(command.format(message.sender.data['magnet']))
 
         # Show files on 'f'
-        elif message.sender.key == 'f' and isinstance(message.sender, SearchResult):
-            self.log(f"showing files for {message.sender.data['id']}: {message.sender.data['name']}")
-            file_names = self.client.filenames(message.sender.data['id'])
-            user = {'username': message.sender.data['username'], 'status': message.sender.data['status']}
-            self.files_sidebar.update_data(file_names, user)
-            self.log(file_names)
-            self.log(user)
-            self.action_toggle_files_sidebar()
+        elif message.sender.key == 'f' and isinstance(message.sender, ResultList):
+            if self.files_task is not None: self.files_task.cancel()
+            self.files_task = self.run_in_background(self.show_files(message.sender.data))
 
         # Download on 'd'
-        elif message.sender.key == 'd' and isinstance(message.sender, SearchResult):
-            if self.transmission_client is None:
-                transmission_added = await self.add_transmission_client()
-                if not transmission_added:
-                    #TODO add failure notification if transmission settings not configured correctly
-                    self.log(f"unable to download torrent {message.sender.data['id']}: {message.sender.data['name']}")
-                    return None
-            self.log(f"downloading {message.sender.data['id']}: {message.sender.data['name']}")
+        elif message.sender.key == 'd' and isinstance(message.sender, ResultList):
+            results = message.sender.take_marked()
+            for r in results:
+                self.log(f"downloading {r['id']}: {r['name']}")
             await self.highlight_footer_key('d')
-            await self.download(message.sender.data['magnet'])
+            self.download_task = self.run_in_background(self.download(results))
+
+        # Show sort order on 's'
+        elif message.sender.key == 's' and isinstance(message.sender, ResultList):
+            sort_key = message.sender.sort_key
+            await self.set_search_status(None if sort_key is None else f'sorted by {sort_key}')
 
         # Triggered on widget focus
-        elif message.sender.key == 'focus' and isinstance(message.sender, SearchResult):
+        elif message.sender.key == 'focus' and isinstance(message.sender, ResultList):
             await self.handle_searchresult_on_focus(message)
 
-    async def download(self, magnet: str) -> None:
-        """Trigger transmission download"""
+    async def show_files(self, data: dict) -> None:
+        """Fetch file list off the message loop and open files sidebar"""
 
-        self.transmission_client.add_torrent(magnet)
+        self.log(f"showing files for {data['id']}: {data['name']}")
+        file_names = await self.prefetcher.filenames(data['id'])
+        user = {'username': data['username'], 'status': data['status']}
+        self.files_sidebar.update_data(file_names, user)
+        self.log(file_names)
+        self.log(user)
+        self.action_toggle_files_sidebar()
+
+    async def download(self, results: list) -> None:
+        """Send results to transmission in one batch, skipping torrents it already has"""
+
+        try:
+            report = await self.transmission_client.add({r['info_hash']: r['magnet'] for r in results})
+        except Exception as e:
+            #TODO add failure notification if transmission settings not configured correctly
+            self.log(f'unable to download {len(results)} torrent(s): {e}')
+            return None
+        self.log('transmission: {} added, {} already present, {} failed'.format(*[len(report[k]) for k in ('added', 'duplicate', 'failed')]))
+        if len(report['added']) == 0: return None
+        self.transfers_monitor.wake()
+        if not self.show_transfers_bar: self.action_toggle_transfers_sidebar()
 
     def watch_show_mirror_bar(self, show_mirror_bar: bool) -> None:
         """Show/hide mirror sidebar"""
@@ -413,10 +876,26 @@ class Baywatch(App):
     def action_toggle_mirror_sidebar(self) -> None:
         """Trigger show/hide mirror sidebar"""
 
-        if not self.show_mirror_bar: self.mirror_sidebar.get_response_time()
+        if not self.show_mirror_bar: self.run_in_background(self.mirror_sidebar.get_response_time())
+        if self.show_stats_bar: self.show_stats_bar = False
         if self.show_files_bar: self.show_files_bar = False
+        if self.show_transfers_bar: self.show_transfers_bar = False
         self.show_mirror_bar = not self.show_mirror_bar
 
+    def watch_show_stats_bar(self, show_stats_bar: bool) -> None:
+        """Show/hide timings sidebar"""
+
+        if show_stats_bar: self.stats_sidebar.refresh()
+        self.stats_sidebar.animate("layout_offset_x", 0 if show_stats_bar else -STATS_SIDEBAR_SIZE)
+
+    def action_toggle_stats_sidebar(self) -> None:
+        """Trigger show/hide timings sidebar"""
+
+        if self.show_mirror_bar: self.show_mirror_bar = False
+        if self.show_files_bar: self.show_files_bar = False
+        if self.show_transfers_bar: self.show_transfers_bar = False
+        self.show_stats_bar = not self.show_stats_bar
+
     def watch_show_files_bar(self, show_files_bar: bool) -> None:
         """Show/hide files sidebar"""
 
@@ -427,33 +906,50 @@ class Baywatch(App):
 
         if self.files_sidebar.data is None: return None
         if self.show_mirror_bar: self.show_mirror_bar = False
+        if self.show_stats_bar: self.show_stats_bar = False
+        if self.show_transfers_bar: self.show_transfers_bar = False
         self.show_files_bar = not self.show_files_bar
 
+    def watch_show_transfers_bar(self, show_transfers_bar: bool) -> None:
+        """Show/hide transfers sidebar; Transmission is only polled while it is visible"""
+
+        self.transfers_sidebar.animate("layout_offset_x", 0 if show_transfers_bar else TRANSFER_SIDEBAR_SIZE)
+        if show_transfers_bar and self.transfers_task is None:
+            self.transfers_task = self.run_in_background(self.transfers_monitor.watch(self.transfers_sidebar.refresh))
+        elif not show_transfers_bar and self.transfers_task is not None:
+            self.transfers_task.cancel()
+            self.transfers_task = None
+
+    def action_toggle_transfers_sidebar(self) -> None:
+        """Trigger show/hide transfers sidebar"""
+
+        if self.show_mirror_bar: self.show_mirror_bar = False
+        if self.show_stats_bar: self.show_stats_bar = False
+        if self.show_files_bar: self.show_files_bar = False
+        self.show_transfers_bar = not self.show_transfers_bar
+
     async def action_next_tab_index(self) -> None:
         """Change tab index to the next widget and focus"""
 
-        if self.show_mirror_bar or self.show_files_bar: return None
-        self.current_index += 1 if self.current_index < (len(self.tab_index) - 1) else -1
+        if self.show_mirror_bar or self.show_stats_bar or self.show_files_bar or self.show_transfers_bar: return None
+        self.current_index = (self.current_index + 1) % self.tab_count
         await self.assign_tab_focus()
 
     async def action_previous_tab_index(self) -> None:
         """Change tab index to the previous widget and focus"""
 
-        if self.show_mirror_bar or self.show_files_bar: return None
-        self.current_index -= 1 if self.current_index > 0 else len(self.tab_index) - 1
+        if self.show_mirror_bar or self.show_stats_bar or self.show_files_bar or self.show_transfers_bar: return None
+        self.current_index = (self.current_index - 1) % self.tab_count
         await self.assign_tab_focus()
 
     async def assign_tab_focus(self) -> None:
         """Set focus to current tab index"""
 
-        idx = self.tab_index[self.current_index]
-        if idx.startswith('search_results'):
-            widget = self.search_results.widgets_list[int(idx.split('[')[1].split(']')[0])]
-            await widget.focus()
-            if not widget.visible:
-                self.search_results.page_down() # TODO
+        if self.current_index >= len(self.tab_index):
+            self.search_results.cursor = self.current_index - len(self.tab_index)
+            if self.focused is not self.search_results: await self.search_results.focus()
         else:
-            await getattr(self, idx).focus()
+            await getattr(self, self.tab_index[self.current_index]).focus()
 
     async def action_reset_focus(self) -> None:
         """Removes focus from any widget"""
@@ -469,31 +965,37 @@ class Baywatch(App):
     async def handle_searchresult_on_focus(self, message: ButtonPressed) -> None:
         """Update current index when search result is focused"""
 
-        self.current_index = message.sender.idx+1
+        self.current_index = message.sender.idx + len(self.tab_index)
+        if message.sender.data is not None:
+            # only the rows around the cursor, so a keypress costs the same for any number of results
+            idx, radius = message.sender.idx, self.prefetcher.radius
+            start = max(0, idx - radius)
+            self.prefetcher.focus([r['id'] for r in message.sender.results[start:idx + radius + 1]], idx, offset=start)
+
+    async def shutdown(self) -> None:
+        """Cancel background work and release connections before closing"""
+
+        for task in (self.client_ready, self.debounce_task, self.search_task, self.files_task, self.transfers_task):
+            if task is not None: task.cancel()
+        if hasattr(self, 'prefetcher'): self.prefetcher.cancel_all()
+        self.async_client.shutdown()
+        self.transmission_client.shutdown()
+        self.config.close()
+        if self.profiler is not None: self.profiler.stop()
+        await super().shutdown()
 
     async def shutdown_and_run(self, command: str, detach: bool = False) -> None:
         """Quit app and run command on exit"""
 
         self.log('running {}'.format(command))
         command = 'sleep 1 && {}{}'.format(command, ' &' if detach else '')
+        import subprocess
         subprocess.run(command, shell=True)
         await self.shutdown()
 
-def parse() -> argparse.Namespace:
-    """Argument parser; options for launching configuration editor or enabling logs"""
-
-    parser = argparse.ArgumentParser()
-    parser.add_argument("-c", "--config", help="configure settings", action="store_true")
-    parser.add_argument("-l", "--log", help=".log file to log actions", nargs='?', default=None)
-    parser.add_argument("-v", "--version", action="version", version='%(prog)s {version}'.format(version=__version__))
-    return parser.parse_args()
-
 def main():
-    args = parse()
-    if args.config:
-        ConfigUpdateForm.run(title='baywatch config', log=args.log)
-    else:
-        Baywatch.run(title='baywatch', log=args.log)
+    from baywatch.cli import main as cli_main
+    cli_main()
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from baywatch.bay import Bay
+from baywatch.results import Result
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import AsyncIterator, Callable
+import asyncio
+import threading
+
+
+class AsyncBay(object):
+    """Awaitable facade over Bay; blocking calls run on a dedicated worker pool so the event loop stays free.
+
+    Cancelling an awaiting coroutine drops its result; calls that have not started yet are never sent.
+    """
+
+    def __init__(self, client: Bay, workers: int = 4) -> None:
+        self.client = client
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='bay')
+
+    @property
+    def mirror(self) -> str | None:
+        return self.client.mirror
+
+    @property
+    def ready(self) -> threading.Event:
+        return self.client.ready
+
+    async def run(self, method: Callable, *args, **kwargs) -> object:
+        """Run a blocking callable on the worker pool."""
+
+        return await asyncio.get_running_loop().run_in_executor(self.executor, partial(method, *args, **kwargs))
+
+    async def resolve_mirror(self) -> str | None:
+        return await self.run(self.client.resolve_mirror)
+
+    async def update_mirror(self, update_list: bool = True) -> str:
+        return await self.run(self.client.update_mirror, update_list=update_list)
+
+    async def get_active_mirror_response(self) -> str:
+        return await self.run(self.client.get_active_mirror_response)
+
+    async def search(self, query: str, category: str = 'All') -> list:
+        return await self.run(self.client.search, query, category=category)
+
+    async def search_stream(self, query: str, category: str = 'All') -> AsyncIterator[list[Result]]:
+        """Yield batches of results as they are parsed from the response; leaving the loop stops the download."""
+
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        cancelled = threading.Event()
+        done = object()
+
+        def put(item: object) -> None:
+            if cancelled.is_set(): return None
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+            except RuntimeError:
+                # loop closed while streaming
+                cancelled.set()
+
+        def produce() -> None:
+            try:
+                for result in self.client.search_stream(query, category=category, cancelled=cancelled):
+                    put(result)
+                put(done)
+            except Exception as e:
+                put(e)
+
+        loop.run_in_executor(self.executor, produce)
+        try:
+            while True:
+                batch = [await queue.get()]
+                while not queue.empty():
+                    batch.append(queue.get_nowait())
+                results = [r for r in batch if isinstance(r, Result)]
+                if len(results) > 0: yield results
+                if isinstance(batch[-1], Exception): raise batch[-1]
+                if batch[-1] is done: return
+        finally:
+            cancelled.set()
+
+    async def local_search(self, query: str, limit: int = 100, category: str = 'All') -> list[Result]:
+        return await self.run(self.client.local_search, query, limit=limit, category=category)
+
+    async def browse(self, category: str) -> list:
+        return await self.run(self.client.browse, category)
+
+    async def browse_many(self, categories: list[str], top: int = 100, order: str = 'seeders') -> list[Result]:
+        return await self.run(self.client.browse_many, categories, top=top, order=order)
+
+    async def filenames(self, id_no: str | int) -> list:
+        return await self.run(self.client.filenames, id_no)
+
+    async def description(self, id_no: str | int) -> str:
+        return await self.run(self.client.description, id_no)
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False)
+        self.client.close()
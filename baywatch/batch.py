@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from baywatch.bay import Bay
+
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Iterable, Iterator, TextIO
+import json
+import os
+import sys
+
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), 'data/conf.json')
+
+
+def read_queries(queries: list[str] | None = None, stream: TextIO = sys.stdin) -> Iterator[str]:
+    """Yield queries from arguments, or one per non-empty line of 'stream' if there are none."""
+
+    if queries:
+        yield from queries
+        return
+    for line in stream:
+        if len(line.strip()) > 0: yield line.strip()
+
+def run_batch(client: Bay, queries: Iterable[str], category: str = 'All', browse: bool = False, workers: int = 8, limit: int | None = None, out: TextIO = sys.stdout) -> int:
+    """Run queries concurrently on at most 'workers' threads, writing each query's results as JSON lines once it finishes.
+
+    Queries are read lazily, so input of any length is held to a bounded window. Failed queries are written as
+    {"query": ..., "error": ...}; returns the number of failures.
+    """
+
+    def lookup(query: str) -> list:
+        return client.browse(query) if browse else client.search(query, category=category)
+
+    queries = iter(queries)
+    failed = 0
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='batch') as executor:
+        pending = {}
+        while True:
+            for query in queries:
+                pending[executor.submit(lookup, query)] = query
+                if len(pending) >= workers * 2: break
+            if len(pending) == 0: break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                query = pending.pop(future)
+                try:
+                    results = [r for r in future.result() if r is not None][:limit]
+                except Exception as e:
+                    failed += 1
+                    out.write(json.dumps({'query': query, 'error': str(e) or repr(e)}) + '\n')
+                    continue
+                out.write(''.join(json.dumps(dict(query=query, **r.to_dict())) + '\n' for r in results))
+            out.flush()
+    return failed
+
+def run_top(client: Bay, categories: Iterable[str], top: int = 100, order: str = 'seeders', workers: int = 8, out: TextIO = sys.stdout) -> int:
+    """Write the overall top results across categories as JSON lines; returns 1 if nothing could be browsed."""
+
+    categories = list(categories)
+    try:
+        results = client.browse_many(categories, top=top, order=order, workers=workers)
+    except Exception as e:
+        out.write(json.dumps({'query': categories, 'error': str(e) or repr(e)}) + '\n')
+        return 1
+    out.write(''.join(json.dumps(dict(query=categories, **r.to_dict())) + '\n' for r in results))
+    out.flush()
+    return 0
+
+def main(queries: list[str] | None = None, category: str = 'All', browse: bool = False, workers: int = 8, limit: int | None = None, top: int | None = None, order: str = 'seeders') -> int:
+    """Headless entry point; uses conf.json network and cache settings but leaves the interactive index and timings alone"""
+
+    with open(CONFIG_PATH, 'r') as f:
+        config = json.load(f)
+    pool_size = max(workers, int((config.get('network') or {}).get('pool_size', 10)))
+    client = Bay.from_config(config, pool_size=pool_size, index_path=None, timings_path=None)
+    try:
+        if browse and top is not None: return run_top(client, read_queries(queries), top=top, order=order, workers=workers)
+        return run_batch(client, read_queries(queries), category=category, browse=browse, workers=workers, limit=limit)
+    finally:
+        client.close()
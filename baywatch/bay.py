@@ -4,74 +4,234 @@ from __future__ import annotations
 
 import requests
 import urllib.parse
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, Future, CancelledError, as_completed, wait, FIRST_COMPLETED, TimeoutError as FuturesTimeout
+from collections import deque
+from datetime import timedelta
+from typing import Callable, Iterator, NamedTuple
+from functools import lru_cache
 import json
 import os
+import threading
+import time
+import codecs
+import heapq
 
 from baywatch.version import __version__
+from baywatch.cache import ResultCache, DiskCache, RESULTS_DB
+from baywatch.results import Result, filesize_readable, iter_json_array
+from baywatch.health import MirrorHealth, HEALTH_PATH
+from baywatch.index import LocalIndex, INDEX_DB
+from baywatch.timing import Timings, TimedAdapter, TIMINGS_PATH
 
 CATEGORIES = os.path.join(os.path.dirname(__file__), 'data/categories.json')
 SHORT_CATEGORIES = os.path.join(os.path.dirname(__file__), 'data/categories_short.json')
 MIRRORS = os.path.join(os.path.dirname(__file__), 'data/mirrors.txt')
 TRACKERS = os.path.join(os.path.dirname(__file__), 'data/trackers.txt')
+MIRROR_LIST_URL = 'https://proxy-bay.app/list.txt'
+BROWSE_ORDER = {
+    'seeders': lambda r: (int(r.seeders), r.timestamp),
+    'added': lambda r: (r.timestamp, int(r.seeders)),
+}
 
-class Bay():
+class CategoryIndex(NamedTuple):
+    """Category tables compiled into lookup indexes"""
 
-    def __init__(self, default_mirror: str | None = None, default_timeout: int = 5, user_agent: str = 'bay-v{}'.format(__version__)) -> None:
+    categories: dict
+    categories_short: dict
+    ids: dict
+    names: dict
 
-        self.mirror_list_url = 'https://proxy-bay.app/list.txt'
+@lru_cache(maxsize=None)
+def load_category_index() -> CategoryIndex:
+    """Load category tables once per process and build forward (alias -> id) and reverse (id -> name) indexes."""
 
-        self.timeout = default_timeout
-        self.headers = {'User-Agent': user_agent}
+    with open(CATEGORIES, 'r') as c:
+        categories = json.load(c)
+    with open(SHORT_CATEGORIES, 'r') as sc:
+        categories_short = json.load(sc)
 
-        with open(CATEGORIES, 'r') as c:
-            self.categories = json.load(c)
-        with open(SHORT_CATEGORIES, 'r') as sc:
-            self.categories_short = json.load(sc)
+    # later entries take precedence: full names < video short names < abbreviations
+    ids = {k.lower(): v for k,v in categories.items()}
+    ids.update({k.lower().split('/')[-1]: v for k,v in categories.items() if str(v).startswith('2')})
+    ids.update({k.lower(): v for k,v in categories_short.items()})
 
-        if default_mirror is None:
-            self.mirror = self.update_mirror()
-        else:
-            self.mirror = default_mirror
-            mirror_status = self.__requests_get(self.mirror)
-            if not mirror_status.ok: self.mirror = self.update_mirror()
+    names = {}
+    for k,v in categories.items():
+        names.setdefault(int(v), k)
 
-        self.announce = self.build_announce_list()
+    return CategoryIndex(categories, categories_short, ids, names)
 
-    def get_mirror_list(self, local: bool = False) -> list[str]:
-        """Return list of mirrors from published proxy-bay list. Uses local list if 'local' is True or if unable to reach proxy-bay."""
+class Bay():
 
-        if local:
-            with open(MIRRORS, 'r') as f:
-                return f.read().splitlines()
+    def __init__(self, default_mirror: str | None = None, default_timeout: int = 5, user_agent: str = 'bay-v{}'.format(__version__), probe_workers: int = 8, probe_deadline: float = 3, lazy: bool = False, pool_size: int = 10, retries: int = 2, backoff: float = 0.3, compression: bool = True, cache_size: int = 128, cache_ttl: float = 600, cache_path: str | None = None, details_cache_size: int = 256, mirror_list_url: str = MIRROR_LIST_URL, health_path: str | None = None, failover: int = 2, hedge: bool = False, hedge_percentile: float = 95, hedge_delay: float = 1.0, index_path: str | None = None, index_max_rows: int = 50000, index_max_age: float = 90 * 86400, timings_path: str | None = None) -> None:
 
-        list_response = self.__requests_get(self.mirror_list_url)
-        if not list_response.ok:
-            with open(MIRRORS, 'r') as f:
-                return f.splitlines()
-        return list_response.text.splitlines()[3:]
+        self.mirror_list_url = mirror_list_url
 
-    def get_mirror_responses(self, update_list: bool = True) -> dict:
-        """Get response times from all mirrors (raw microseconds)."""
+        self.timeout = default_timeout
+        self.probe_workers = probe_workers
+        self.probe_deadline = probe_deadline
+        self.headers = {'User-Agent': user_agent}
+        self.headers['Accept-Encoding'] = requests.utils.DEFAULT_ACCEPT_ENCODING if compression else 'identity'
+
+        self.pool_size = pool_size
+        self.retries = retries
+        self.backoff = backoff
+        self.sessions = {}
+        self.sessions_lock = threading.Lock()
+
+        self.cache = ResultCache(maxsize=cache_size, ttl=cache_ttl)
+        self.disk_cache = DiskCache(cache_path, ttl=cache_ttl) if cache_path is not None else None
+        self.details_cache = ResultCache(maxsize=details_cache_size, ttl=cache_ttl)
+        self.index = LocalIndex(index_path, max_rows=index_max_rows, max_age=index_max_age) if index_path is not None else None
+        self.inflight = {}
+        self.inflight_lock = threading.Lock()
+        self.coalesced = 0
+
+        self.health = MirrorHealth(health_path)
+        self.failover = failover
+        self.timings = Timings(timings_path)
+
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_default_delay = hedge_delay
+        self.hedge_executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix='bay-hedge') if hedge else None
+        self.hedge_lock = threading.Lock()
+        self.hedge_stats = {'requests': 0, 'hedged': 0, 'hedge_wins': 0}
+        self.latency_samples = {}
+
+        self.category_index = load_category_index()
+        self.categories = self.category_index.categories
+        self.categories_short = self.category_index.categories_short
+
+        self.available_mirrors = self.get_mirror_list(local=True)
+        self.announce = self.build_announce_list()
 
-        if update_list: self.available_mirrors = self.get_mirror_list()
-        response_times = {}
-        for m in self.available_mirrors:
+        self.mirror = default_mirror
+        self.ready = threading.Event()
+        if not lazy: self.resolve_mirror()
+
+    @classmethod
+    def from_config(cls, config: dict, **kwargs) -> Bay:
+        """Build a client from conf.json data ('mirror', 'user_agent' and the 'network', 'cache' and 'index' blocks); keyword arguments override."""
+
+        network = config.get('network') or {}
+        cache = config.get('cache') or {}
+        index = config.get('index') or {}
+        options = dict(
+            default_timeout=float(network.get('timeout', 5)),
+            user_agent=config.get('user_agent', 'bay-v{}').format(__version__),
+            pool_size=int(network.get('pool_size', 10)),
+            retries=int(network.get('retries', 2)),
+            backoff=float(network.get('backoff', 0.3)),
+            compression=network.get('compression', True),
+            cache_size=int(cache.get('size', 128)),
+            cache_ttl=float(cache.get('ttl', 600)),
+            cache_path=RESULTS_DB if cache.get('disk', False) else None,
+            health_path=HEALTH_PATH,
+            hedge=network.get('hedge', False),
+            hedge_percentile=float(network.get('hedge_percentile', 95)),
+            index_path=INDEX_DB if index.get('enabled', True) else None,
+            index_max_rows=int(index.get('max_rows', 50000)),
+            index_max_age=float(index.get('max_age_days', 90)) * 86400,
+            timings_path=TIMINGS_PATH,
+        )
+        options.update(kwargs)
+        return cls(config.get('mirror'), **options)
+
+    def resolve_mirror(self) -> str | None:
+        """Check the configured mirror, falling back to the fastest available mirror. Releases requests waiting on a mirror."""
+
+        try:
+            if self.mirror is None or not self.check_mirror(self.mirror):
+                self.update_mirror()
+        finally:
+            self.ready.set()
+        return self.mirror
+
+    def wait_for_mirror(self, timeout: float | None = None) -> str:
+        """Block until mirror selection has finished; returns active mirror."""
+
+        if not self.ready.wait(timeout) or self.mirror is None:
+            raise ConnectionError('no mirror available')
+        return self.mirror
+
+    def check_mirror(self, mirror: str) -> bool:
+        """Return True if mirror responds OK."""
+
+        try:
+            return self.__requests_get(mirror, retries=0).ok
+        except requests.exceptions.RequestException:
+            return False
+
+    def get_mirror_list(self, local: bool = False) -> list[str]:
+        """Return list of mirrors from published proxy-bay list. Uses local list if 'local' is True or if unable to reach proxy-bay."""
+
+        if not local:
             try:
-                response_times[m] = self.__requests_get(m).elapsed
-            except:
-                continue
+                # a single attempt within the probe deadline; the bundled list is the fallback anyway
+                list_response = self.__requests_get(self.mirror_list_url, timeout=min(self.timeout, self.probe_deadline), retries=0)
+                if list_response.ok:
+                    return [m for m in list_response.text.splitlines()[3:] if len(m) > 0]
+            except requests.exceptions.RequestException:
+                pass
+
+        with open(MIRRORS, 'r') as f:
+            return [m for m in f.read().splitlines() if len(m) > 0]
+
+    def probe_mirrors(self, mirrors: list[str] | None = None, deadline: float | None = None, healthy: int | None = None) -> Iterator[tuple[str, timedelta]]:
+        """Probe mirrors concurrently, yielding (mirror, elapsed) for healthy mirrors in arrival order.
+
+        Stops after 'deadline' seconds overall or once 'healthy' mirrors have answered; unfinished probes are abandoned.
+        """
+
+        mirrors = self.available_mirrors if mirrors is None else mirrors
+        deadline = self.probe_deadline if deadline is None else deadline
+        if len(mirrors) == 0: return
+
+        executor = ThreadPoolExecutor(max_workers=min(self.probe_workers, len(mirrors)))
+        futures = {executor.submit(self.__requests_get, m, timeout=min(self.timeout, deadline), retries=0): m for m in mirrors}
+        answered = 0
+        try:
+            for future in as_completed(futures, timeout=deadline):
+                try:
+                    response = future.result()
+                except Exception:
+                    self.health.record_failure(futures[future])
+                    continue
+                if not response.ok:
+                    self.health.record_failure(futures[future])
+                    continue
+                self.health.record_success(futures[future], response.elapsed.total_seconds())
+                answered += 1
+                yield futures[future], response.elapsed
+                if healthy is not None and answered >= healthy: break
+        except FuturesTimeout:
+            pass
+        finally:
+            for future in futures: future.cancel()
+            executor.shutdown(wait=False)
+
+    def get_mirror_responses(self, update_list: bool = True, deadline: float | None = None, healthy: int | None = None) -> dict:
+        """Get response times from mirrors (timedelta), probed concurrently and sorted fastest first."""
 
+        if update_list: self.available_mirrors = self.get_mirror_list()
+        response_times = dict(self.probe_mirrors(deadline=deadline, healthy=healthy))
         return dict(sorted(response_times.items(), key=lambda t: t[1]))
 
     def get_active_mirror_response(self) -> str:
         """Return response time of current mirror in seconds (to the millisecond)."""
-        return '{0:.3f}'.format(self.__requests_get(self.mirror).elapsed.microseconds / 1000000)
+        return '{0:.3f}'.format(self.__requests_get(self.mirror).elapsed.total_seconds())
 
     def update_mirror(self, update_list: bool = True) -> str:
-        """Get response times from all mirrors and make fasted mirror active."""
-        response_times = self.get_mirror_responses(update_list=update_list)
-        return min(response_times, key=response_times.get)
+        """Probe mirrors concurrently and make the first healthy responder active."""
+
+        if update_list: self.available_mirrors = self.get_mirror_list()
+        for mirror, _ in self.probe_mirrors(healthy=1):
+            self.mirror = mirror
+            self.health.save()
+            return mirror
+        self.health.save()
+        raise ConnectionError('no mirror responded within {} sec'.format(self.probe_deadline))
 
     def build_announce_list(self) -> str:
         """Build announce list"""
@@ -81,32 +241,265 @@ class Bay():
         return '&'.join([f'tr={urllib.parse.quote_plus(t)}' for t in trackers if len(t)>0])
 
     def search(self, query: str, category: str ='All') -> dict:
-        """Return search query."""
-        url = '{}/apibay/q.php'.format(self.mirror)
+        """Return search query. Results are cached per (mirror, query, category)."""
+        self.wait_for_mirror()
         query = {
             'q': query,
             'cat': self.__category_map(category),
         }
-        response = self.__requests_get(url, params=query)
-        results = response.json()
+        key = (self.mirror, query['q'], query['cat'])
+        results = self.cache.get(key)
+        if results is not None: return results
+
+        future, owner = self.__claim(key)
+        if not owner: return self.__join(future, query['q'], category)
+        try:
+            results = self.disk_cache.get(key) if self.disk_cache is not None else None
+            if results is None:
+                results = self.__api_get('q.php', params=query, hedge=True)
+                if self.disk_cache is not None: self.disk_cache.put(key, results)
+
+            results = self.__cache_results(key, results)
+            future.set_result(results)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self.__release(key, future)
+        return results
 
-        if results[0]['name'] == 'No results returned' and results[0]['id'] == '0':
-            return [None]
+    def search_stream(self, query: str, category: str = 'All', chunk_size: int = 8192, cancelled: threading.Event | None = None) -> Iterator[Result]:
+        """Yield formatted results as the response body arrives instead of after the full download.
 
-        results = self.__format_results(results)
+        Served from cache when possible. Mirrors are chosen, hedged and failed over like search(); once results have
+        been yielded a failure is raised instead. Setting 'cancelled' stops the stream and closes the connection.
+        """
 
+        self.wait_for_mirror()
+        params = {
+            'q': query,
+            'cat': self.__category_map(category),
+        }
+        key = (self.mirror, params['q'], params['cat'])
+        results = self.cache.get(key)
+        if results is None and self.disk_cache is not None:
+            raw = self.disk_cache.get(key)
+            if raw is not None: results = self.__cache_results(key, raw)
+        if results is not None:
+            yield from (r for r in results if r is not None)
+            return
+
+        future, owner = self.__claim(key)
+        if not owner:
+            yield from (r for r in self.__join(future, query, category) if r is not None)
+            return
+
+        raw = []
+        tried = []
+        try:
+            while True:
+                mirror, response = self.__open_stream(params, tried)
+                try:
+                    text = codecs.getincrementaldecoder(response.encoding or 'utf-8')()
+                    download_started = time.perf_counter()
+                    for item in iter_json_array(text.decode(chunk) for chunk in response.iter_content(chunk_size)):
+                        if cancelled is not None and cancelled.is_set(): return
+                        raw.append(item)
+                        if item.get('name') == 'No results returned' and item.get('id') == '0': continue
+                        yield Result(item, self.announce, self.category_index.names)
+                    self.timings.record('download', time.perf_counter() - download_started)
+                except (requests.exceptions.RequestException, ValueError):
+                    self.health.record_failure(mirror)
+                    # nothing yielded yet, so another mirror can still serve the whole response
+                    if len(raw) == 0 and self.__fallback_mirror(tried) is not None: continue
+                    raise
+                finally:
+                    response.close()
+                break
+        except (requests.exceptions.RequestException, ValueError) as e:
+            future.set_exception(e)
+            raise
+        else:
+            self.health.record_success(mirror, response.elapsed.total_seconds())
+            self.mirror = mirror
+            if self.disk_cache is not None: self.disk_cache.put(key, raw)
+            future.set_result(self.__cache_results(key, raw))
+        finally:
+            self.__release(key, future)
+
+    def __open_stream(self, params: dict, tried: list) -> tuple[str, requests.models.Response]:
+        """Open a streamed q.php response, choosing, hedging and failing over mirrors like __api_get.
+
+        While another mirror could take over, each mirror gets a single attempt, so a hung mirror costs one timeout
+        rather than one per retry.
+        """
+
+        while True:
+            if len(tried) == 0:
+                mirror = self.wait_for_mirror()
+                if not self.health.is_available(mirror):
+                    mirror = self.health.best(self.available_mirrors) or mirror
+            else:
+                mirror = self.__fallback_mirror(tried)
+            tried.append(mirror)
+            retries = 0 if self.__fallback_mirror(tried) is not None else None
+            try:
+                if self.hedge:
+                    return self.__hedge(mirror, 'q.php', tried, lambda m: self.__stream_response(m, params, retries), discard=lambda r: r.close())
+                return mirror, self.__stream_response(mirror, params, retries)
+            except (requests.exceptions.RequestException, ValueError):
+                if retries is None: raise
+
+    def __stream_response(self, mirror: str, params: dict, retries: int | None = None) -> requests.models.Response:
+        """Request q.php from 'mirror' leaving the body unread; failures are recorded in mirror health."""
+
+        response = None
+        try:
+            response = self.__requests_get('{}/apibay/q.php'.format(mirror), params=params, retries=retries, stream=True)
+            response.raise_for_status()
+        except requests.exceptions.RequestException:
+            if response is not None: response.close()
+            self.health.record_failure(mirror)
+            raise
+        with self.hedge_lock:
+            self.latency_samples.setdefault('q.php', deque(maxlen=100)).append(response.elapsed.total_seconds())
+        return response
+
+    def __fallback_mirror(self, tried: list) -> str | None:
+        """Healthiest mirror not tried yet, or None once failover is exhausted."""
+
+        if len(tried) > self.failover: return None
+        return self.health.best([m for m in self.available_mirrors if m not in tried])
+
+    def __cache_results(self, key: tuple, raw: list) -> list:
+        """Format raw q.php results and store them in the memory cache."""
+
+        if len(raw) == 0 or (raw[0]['name'] == 'No results returned' and raw[0]['id'] == '0'):
+            results = [None]
+        else:
+            results = self.__format_results(raw)
+            if self.index is not None: self.index.add(results)
+
+        self.cache.put(key, results)
         return results
 
+    def local_search(self, query: str, limit: int = 100, category: str = 'All') -> list[Result]:
+        """Return results available without a request: cached results of a shorter query filtered client-side, then
+        matches from the local index. Empty for category browsing."""
+
+        if query.startswith('category:'): return []
+        results = self.__filter_cached(query, category)
+        if self.index is not None:
+            seen = {r.info_hash for r in results}
+            results += [
+                r for r in self.index.search(query, limit=limit, announce=self.announce, category_names=self.category_index.names)
+                if r.info_hash not in seen
+            ]
+        return results[:limit]
+
+    def __filter_cached(self, query: str, category: str = 'All') -> list[Result]:
+        """Filter cached results of the longest cached prefix of 'query' down to names containing every word of it."""
+
+        words = query.lower().split()
+        if len(words) == 0: return []
+        cat = self.__category_map(category)
+        best = None
+        for (mirror, q, c), results in self.cache.items():
+            if mirror != self.mirror or c != cat or not query.lower().startswith(q.lower()): continue
+            if best is None or len(q) > len(best[0]): best = (q, results)
+        if best is None: return []
+        return [r for r in best[1] if r is not None and all(w in r.name.lower() for w in words)]
+
+    def __claim(self, key: tuple) -> tuple[Future, bool]:
+        """Return the future for an identical request in flight, or a new one the caller owns and must complete."""
+
+        with self.inflight_lock:
+            future = self.inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            future = self.inflight[key] = Future()
+            return future, True
+
+    def __release(self, key: tuple, future: Future) -> None:
+        """Stop sharing an owned request; waiters on an abandoned one are released to retry."""
+
+        with self.inflight_lock:
+            if self.inflight.get(key) is future: del self.inflight[key]
+        if not future.done(): future.cancel()
+
+    def __join(self, future: Future, query: str, category: str) -> list:
+        """Wait for an identical search in flight; search again if it was abandoned."""
+
+        try:
+            return future.result()
+        except CancelledError:
+            return self.search(query, category)
+
+    def cache_stats(self) -> dict:
+        """Return hit/miss counters for result caches."""
+
+        stats = {'memory': self.cache.stats(), 'coalesced': self.coalesced}
+        if self.disk_cache is not None: stats['disk'] = self.disk_cache.stats()
+        return stats
+
     def browse(self, category: str) -> dict:
         query = 'category:{}'.format(self.__category_map(category))
         return self.search(query)
 
+    def browse_many(self, categories: list[str], top: int = 100, order: str = 'seeders', workers: int | None = None) -> list[Result]:
+        """Browse several categories concurrently and return the overall 'top' results by 'order' ('seeders' or 'added').
+
+        Each category's page is fetched without caching and folded into a bounded heap as soon as it arrives, then
+        dropped, so memory stays at 'top' results plus the pages in flight however many categories are requested.
+        Torrents listed in more than one category appear once. Categories that fail are skipped; raises the last error
+        only if every category failed.
+        """
+
+        key = BROWSE_ORDER[order]
+        ids = list(dict.fromkeys(self.__category_map(c) for c in categories))
+        heap = []
+        members = set()
+        error = None
+        self.wait_for_mirror()
+        with ThreadPoolExecutor(max_workers=min(workers or self.pool_size, max(1, len(ids))), thread_name_prefix='bay-browse') as executor:
+            pending = {executor.submit(self.__browse_page, i) for i in ids}
+            for future in as_completed(pending):
+                # as_completed lets go of finished futures; so must we, or every page stays alive until the end
+                pending.discard(future)
+                try:
+                    results = future.result()
+                except Exception as e:
+                    error = e
+                    continue
+                for r in results:
+                    if r.info_hash in members: continue
+                    entry = (key(r), r.info_hash, r)
+                    if len(heap) < top:
+                        heapq.heappush(heap, entry)
+                    elif entry[:2] > heap[0][:2]:
+                        members.discard(heapq.heapreplace(heap, entry)[1])
+                    else:
+                        continue
+                    members.add(r.info_hash)
+        if len(heap) == 0 and error is not None: raise error
+        return [entry[2] for entry in sorted(heap, key=lambda e: e[:2], reverse=True)]
+
+    def __browse_page(self, category_id: int) -> list[Result]:
+        """One category's listing, bypassing the result caches and the local index."""
+
+        raw = self.__api_get('q.php', params={'q': 'category:{}'.format(category_id), 'cat': 0}, hedge=True)
+        if len(raw) == 0 or (raw[0]['name'] == 'No results returned' and raw[0]['id'] == '0'): return []
+        return self.__format_results(raw)
+
     def filenames(self, id_no: str| int) -> list:
-        """Return filename and filesize data for listing."""
+        """Return filename and filesize data for listing. Cached per torrent id."""
+
+        key = ('files', str(id_no))
+        cached = self.details_cache.get(key)
+        if cached is not None: return cached
 
-        url = '{}/apibay/f.php'.format(self.mirror)
-        response = self.__requests_get(url, params={'id': id_no})
-        results = response.json()
+        results = self.__api_get('f.php', params={'id': id_no}, hedge=True)
         for i,r in enumerate(results):
             try:
                 r['name'] = r['name']['0']
@@ -117,64 +510,187 @@ class Bay():
             # r['magnet'] = 'magnet:?xt=urn:btih:{}&dn={}&so={}'.format(init_data['info_hash'], r['name'], i) # 'so=' not handled by clients?
 
         if len(results) == 1 and results[0]['size'] == '0.0 B':
-            return []
+            results = []
 
+        self.details_cache.put(key, results)
         return results
 
     def description(self, id_no: str| int) -> str:
-        """Return user-provided description for listing."""
+        """Return user-provided description for listing. Cached per torrent id."""
+
+        key = ('descr', str(id_no))
+        cached = self.details_cache.get(key)
+        if cached is not None: return cached
 
-        url = '{}/apibay/t.php'.format(self.mirror)
-        response = self.__requests_get(url, params={'id': id_no})
-        results = response.json()
+        results = self.__api_get('t.php', params={'id': id_no})
+        self.details_cache.put(key, results['descr'])
         return results['descr']
 
-    def __requests_get(self, url: str, params: dict| None = None, timeout: int | None = None, headers: dict | None = None) -> requests.models.Response:
+    def __api_get(self, endpoint: str, params: dict | None = None, hedge: bool = False) -> list | dict:
+        """GET an apibay endpoint and decode JSON; on failure fail over to the healthiest other mirror.
+
+        With 'hedge' (and hedging enabled on the client) slow requests are duplicated to a second mirror.
+        """
+
+        mirror = self.wait_for_mirror()
+        if not self.health.is_available(mirror):
+            mirror = self.health.best(self.available_mirrors) or mirror
+        tried = []
+        while True:
+            tried.append(mirror)
+            try:
+                if hedge and self.hedge:
+                    mirror, results = self.__hedged_fetch(mirror, endpoint, params, tried)
+                else:
+                    results = self.__fetch(mirror, endpoint, params)
+            except (requests.exceptions.RequestException, ValueError):
+                fallback = self.health.best([m for m in self.available_mirrors if m not in tried])
+                if fallback is None or len(tried) > self.failover: raise
+                mirror = fallback
+                continue
+            self.mirror = mirror
+            return results
+
+    def __fetch(self, mirror: str, endpoint: str, params: dict | None = None) -> list | dict:
+        """Single apibay request against 'mirror', recorded in mirror health and endpoint latency."""
+
+        try:
+            response = self.__requests_get('{}/apibay/{}'.format(mirror, endpoint), params=params)
+            response.raise_for_status()
+            with self.timings.span('parse'):
+                results = response.json()
+        except (requests.exceptions.RequestException, ValueError):
+            self.health.record_failure(mirror)
+            raise
+        elapsed = response.elapsed.total_seconds()
+        self.health.record_success(mirror, elapsed)
+        with self.hedge_lock:
+            self.latency_samples.setdefault(endpoint, deque(maxlen=100)).append(elapsed)
+        return results
+
+    def hedge_delay(self, endpoint: str) -> float:
+        """Seconds to wait on the primary mirror before hedging: the configured percentile of recent latency."""
+
+        with self.hedge_lock:
+            samples = sorted(self.latency_samples.get(endpoint, []))
+        if len(samples) < 5: return self.hedge_default_delay
+        return samples[min(len(samples) - 1, int(len(samples) * self.hedge_percentile / 100))]
+
+    def __hedged_fetch(self, mirror: str, endpoint: str, params: dict | None, tried: list) -> tuple[str, list | dict]:
+        """Send request to 'mirror'; if it is slower than the hedge delay, send it to the next-best mirror too.
+
+        Returns (mirror, results) for the first valid response. The losing request is cancelled if it has not
+        started, otherwise its result is discarded.
+        """
+
+        return self.__hedge(mirror, endpoint, tried, lambda m: self.__fetch(m, endpoint, params))
+
+    def __hedge(self, mirror: str, endpoint: str, tried: list, request: Callable[[str], object], discard: Callable[[object], None] | None = None) -> tuple[str, object]:
+        """Run request(mirror), racing it against request(next-best mirror) once it is slower than the hedge delay for 'endpoint'.
+
+        Returns (mirror, result) for the first success. 'discard' releases the result of a losing request that
+        completes anyway, e.g. by closing its response.
+        """
+
+        with self.hedge_lock:
+            self.hedge_stats['requests'] += 1
+        primary = self.hedge_executor.submit(request, mirror)
+        done, _ = wait([primary], timeout=self.hedge_delay(endpoint))
+        backup_mirror = self.health.best([m for m in self.available_mirrors if m not in tried and m != mirror])
+        if len(done) > 0 or backup_mirror is None:
+            return mirror, primary.result()
+
+        with self.hedge_lock:
+            self.hedge_stats['hedged'] += 1
+        tried.append(backup_mirror)
+        backup = self.hedge_executor.submit(request, backup_mirror)
+        mirrors = {primary: mirror, backup: backup_mirror}
+        pending = set(mirrors)
+        while True:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            winner = next((f for f in done if f.exception() is None), None)
+            if winner is not None:
+                for loser in mirrors:
+                    if loser is winner: continue
+                    loser.cancel()
+                    if discard is not None:
+                        loser.add_done_callback(lambda f: discard(f.result()) if not f.cancelled() and f.exception() is None else None)
+                if winner is backup:
+                    with self.hedge_lock:
+                        self.hedge_stats['hedge_wins'] += 1
+                return mirrors[winner], winner.result()
+            if len(pending) == 0:
+                raise done.pop().exception()
+
+    def hedge_report(self) -> dict:
+        """Hedged request counters and hedge rate."""
+
+        with self.hedge_lock:
+            report = dict(self.hedge_stats)
+        report['hedge_rate'] = report['hedged'] / report['requests'] if report['requests'] > 0 else 0.0
+        return report
+
+    def session(self, url: str) -> requests.Session:
+        """Return keep-alive session for the origin of 'url', creating it on first use."""
+
+        parts = urllib.parse.urlsplit(url)
+        origin = '{}://{}'.format(parts.scheme, parts.netloc)
+        with self.sessions_lock:
+            if origin not in self.sessions:
+                session = requests.Session()
+                adapter = TimedAdapter(self.timings, pool_connections=1, pool_maxsize=self.pool_size)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                session.headers.update(self.headers)
+                self.sessions[origin] = session
+            return self.sessions[origin]
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+
+        with self.sessions_lock:
+            for session in self.sessions.values():
+                session.close()
+            self.sessions.clear()
+        if self.disk_cache is not None: self.disk_cache.close()
+        if self.hedge_executor is not None: self.hedge_executor.shutdown(wait=False)
+        if self.index is not None: self.index.close()
+        self.health.save()
+        self.timings.save()
+
+    def __requests_get(self, url: str, params: dict| None = None, timeout: int | None = None, headers: dict | None = None, retries: int | None = None, stream: bool = False) -> requests.models.Response:
+        """GET with retries on connection errors and 5xx; records 'ttfb' and, unless streaming, 'download' spans."""
+
         timeout = self.timeout if timeout is None else timeout
         headers = self.headers if headers is None else headers
-        return requests.get(url, params=params, timeout=timeout, headers=headers)
+        retries = self.retries if retries is None else retries
+        session = self.session(url)
+        for attempt in range(retries + 1):
+            try:
+                # always stream so headers and body are timed separately
+                with self.timings.span('ttfb'):
+                    response = session.get(url, params=params, timeout=timeout, headers=headers, stream=True)
+                if response.status_code < 500 or attempt == retries:
+                    if not stream:
+                        with self.timings.span('download'):
+                            response.content
+                    return response
+                response.close()
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt == retries: raise
+            time.sleep(self.backoff * 2 ** attempt)
 
     def __category_map(self, cat: str) -> int:
         """Mapping category or abbreviated category to ID."""
 
-        if cat in self.categories_short:
-            return self.categories_short[cat]
-
-        categories_no_case = {k.lower(): v for k,v in self.categories.items()}
-        video_categories = {k.split('/')[-1]: v for k,v in categories_no_case.items() if str(v).startswith('2')}
-        cat = cat.lower()
-        if cat in video_categories:
-            return video_categories[cat]
-        elif cat in categories_no_case:
-            return categories_no_case[cat]
-        else:
-            return 0
+        return self.category_index.ids.get(cat.lower(), 0)
 
     def __filesize_readable(self, num: int | float | str, suffix: str = 'B') -> str:
         """Return human-readable filesize from bytes."""
+        return filesize_readable(num, suffix)
 
-        num = int(num)
-        for unit in ['','K','M','G','T','P','E','Z']:
-            if abs(num) < 1024.0:
-                return "%3.1f %s%s" % (num, unit, suffix)
-            num /= 1024.0
-        return "%.1f %s%s" % (num, 'Yi', suffix)
-
-    def __format_results(self, results: dict) -> dict:
-        """Generate formatting item details from API response."""
-
-        for r in results:
-            r['size'] = self.__filesize_readable(r['size'])
-            r['magnet'] = f"magnet:?xt=urn:btih:{r['info_hash']}&dn={urllib.parse.quote_plus(r['name'])}&{self.announce}"
-            r['added'] = datetime.strftime(datetime.fromtimestamp(int(r['added'])),'%Y-%m-%d %H:%M')
-            r['num_files'] = r['num_files'] if int(r['num_files']) > 0 else '1'
-            category_name = self.__get_key(int(r['category']), self.categories)
-            r['category_name'] = category_name if category_name is not None else 'Unknown'
-
-        return results
+    def __format_results(self, results: list) -> list[Result]:
+        """Wrap API response items in lazily formatted result records."""
 
-    def __get_key(self, val: str, source_dict: dict) -> str | int | object:
-        """Fetch dictionary key with value."""
-        for key, value in source_dict.items():
-            if val == value:
-                return key
+        with self.timings.span('format'):
+            return [Result(r, self.announce, self.category_index.names) for r in results]
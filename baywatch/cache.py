@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+import json
+import os
+import sqlite3
+import stat
+import tempfile
+import threading
+import time
+
+
+CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')), 'baywatch')
+RESULTS_DB = os.path.join(CACHE_DIR, 'results.sqlite')
+
+
+def write_atomic(path: str, text: str, fsync: bool = False) -> None:
+    """Replace the file at 'path' with 'text' in one step, creating its directory if needed.
+
+    Each call writes its own temp file next to 'path', so concurrent writers (threads or processes) never clobber
+    each other's partial output. The file keeps its permissions; with 'fsync' the data is on disk before the swap.
+    """
+
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix='.{}.'.format(os.path.basename(path)), suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(text)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        # mkstemp creates files owner-only
+        try:
+            mode = stat.S_IMODE(os.stat(path).st_mode)
+        except OSError:
+            mode = 0o644
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class ResultCache(object):
+    """In-memory LRU cache with per-entry TTL"""
+
+    def __init__(self, maxsize: int = 128, ttl: float = 600) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple) -> object | None:
+        """Return cached value or None if missing or expired; marks entry as recently used."""
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl:
+                if entry is not None: del self.entries[key]
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: tuple, value: object) -> None:
+        with self.lock:
+            self.entries[key] = (time.monotonic(), value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def items(self) -> list[tuple]:
+        """Return unexpired (key, value) pairs without touching recency or hit counters."""
+
+        now = time.monotonic()
+        with self.lock:
+            return [(k, v) for k, (stored, v) in self.entries.items() if now - stored <= self.ttl]
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self) -> dict:
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.entries)}
+
+
+class DiskCache(object):
+    """Persistent sqlite cache of raw API responses; survives restarts"""
+
+    def __init__(self, path: str = RESULTS_DB, ttl: float = 600, maxsize: int = 1000) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.db = sqlite3.connect(self.path, check_same_thread=False)
+        with self.lock, self.db:
+            self.db.execute('CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT, stored REAL)')
+
+    def get(self, key: tuple) -> object | None:
+        """Return decoded response or None if missing or expired."""
+
+        with self.lock:
+            row = self.db.execute(
+                'SELECT value FROM responses WHERE key = ? AND stored > ?', (json.dumps(key), time.time() - self.ttl)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return json.loads(row[0])
+
+    def put(self, key: tuple, value: object) -> None:
+        """Store response, pruning expired and least recently stored entries."""
+
+        with self.lock, self.db:
+            self.db.execute(
+                'INSERT OR REPLACE INTO responses (key, value, stored) VALUES (?, ?, ?)', (json.dumps(key), json.dumps(value), time.time())
+            )
+            self.db.execute('DELETE FROM responses WHERE stored <= ?', (time.time() - self.ttl,))
+            self.db.execute(
+                'DELETE FROM responses WHERE key NOT IN (SELECT key FROM responses ORDER BY stored DESC LIMIT ?)', (self.maxsize,)
+            )
+
+    def close(self) -> None:
+        with self.lock:
+            self.db.close()
+
+    def stats(self) -> dict:
+        return {'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from baywatch.version import __version__
+
+import argparse
+import sys
+import time
+
+
+# startup is timed from here, before the app and its dependencies are imported
+LAUNCH_TIME = time.perf_counter()
+
+
+def parse() -> argparse.Namespace:
+    """Argument parser; options for launching configuration editor or enabling logs"""
+
+    parser = argparse.ArgumentParser(prog='baywatch')
+    parser.add_argument("-c", "--config", help="configure settings", action="store_true")
+    parser.add_argument("-l", "--log", help=".log file to log actions", nargs='?', default=None)
+    parser.add_argument("--profile", help="watch for event loop stalls and sample the UI, printing a report on exit", action="store_true")
+    parser.add_argument("-v", "--version", action="version", version='%(prog)s {version}'.format(version=__version__))
+    parser.add_argument("-s", "--search", help="search without the TUI, printing results as JSON lines; reads queries from stdin if none are given", nargs='*', metavar='QUERY', default=None)
+    parser.add_argument("--browse", help="with --search, treat queries as category names to browse", action="store_true")
+    parser.add_argument("--category", help="with --search, category to search in", default='All')
+    parser.add_argument("-w", "--workers", help="with --search, queries to run concurrently", type=int, default=8)
+    parser.add_argument("--limit", help="with --search, maximum results per query", type=int, default=None)
+    parser.add_argument("--top", help="with --browse, merge all categories into the overall top N", type=int, default=None)
+    parser.add_argument("--order", help="with --top, rank by seeders or by date added", choices=['seeders', 'added'], default='seeders')
+    return parser.parse_args()
+
+def main():
+    # each entry point imports only what it runs
+    args = parse()
+    if args.search is not None:
+        from baywatch.batch import main as batch_main
+        sys.exit(1 if batch_main(args.search, category=args.category, browse=args.browse, workers=args.workers, limit=args.limit, top=args.top, order=args.order) > 0 else 0)
+    elif args.config:
+        from baywatch.config_control import ConfigUpdateForm
+        ConfigUpdateForm.run(title='baywatch config', log=args.log)
+    else:
+        from baywatch.app import Baywatch
+        if not args.profile:
+            Baywatch.run(title='baywatch', log=args.log, launch_time=LAUNCH_TIME)
+            return None
+        from baywatch.profiling import Profiler
+        profiler = Profiler()
+        try:
+            Baywatch.run(title='baywatch', log=args.log, profiler=profiler, launch_time=LAUNCH_TIME)
+        finally:
+            profiler.stop()
+            sys.stderr.write(profiler.report())
+
+if __name__ == '__main__':
+    main()
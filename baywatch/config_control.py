@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from baywatch.cache import write_atomic
+
 from rich.align import Align
 
 from textual.app import App
@@ -12,10 +14,12 @@ from textual_inputs import TextInput
 import os
 import json
 import asyncio
+import threading
 
 
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), 'data/conf.json')
 SIDEBAR_SIZE = 60
+DELETED = object()
 
 class Dict(dict):
     """dot.notation access to dictionary attributes"""
@@ -26,33 +30,110 @@ class Dict(dict):
 
 
 class Configuration(object):
-    """JSON configuration object"""
+    """JSON configuration object
+
+    With 'live', changes are written behind: edits within 'delay' seconds are coalesced into one write on a
+    background thread. Writes go to a temporary file that is renamed over the config, so a crash never leaves it
+    half-written. reload() picks up edits made by other processes.
+    """
 
-    def __init__(self, file_path: str, live=True) -> None:
+    def __init__(self, file_path: str, live=True, delay: float = 0.5) -> None:
         self.path = file_path
-        with open(self.path, 'r') as f:
-            self.data = Dict(json.load(f))
         self.live = live
+        self.delay = delay
+        self.lock = threading.RLock()
+        self.write_lock = threading.Lock()
+        self.pending = {}
+        self.timer = None
+        self.stamp = None
+        self.data = Dict()
+        self.__load()
 
     def add(self, key: str, value: str) -> bool:
         try:
-            self.data[key] = value
-            if self.live: self.__update()
+            with self.lock:
+                self.data[key] = value
+                self.pending[key] = value
+            if self.live: self.__schedule()
             return True
         except:
             return False
 
     def delete(self, key: str) -> bool:
         try:
-            del self.data[key]
-            if self.live: self.__update()
+            with self.lock:
+                del self.data[key]
+                self.pending[key] = DELETED
+            if self.live: self.__schedule()
             return True
         except:
             return False
 
-    def __update(self) -> None:
-        with open(self.path, 'w') as f:
-            json.dump(self.data, f, indent=4)
+    def reload(self) -> bool:
+        """Re-read the file if it changed on disk (stat only otherwise); unsaved changes are kept. True if reloaded."""
+
+        try:
+            if self.__stat() == self.stamp: return False
+            with self.lock:
+                self.__load()
+                self.__apply_pending()
+            return True
+        except (OSError, ValueError):
+            # mid-write by another process or unreadable; keep current data
+            return False
+
+    def flush(self) -> None:
+        """Write pending changes now."""
+
+        with self.lock:
+            if self.timer is not None: self.timer.cancel()
+            self.timer = None
+            if len(self.pending) == 0: return None
+        self.__update(merge=True)
+
+    def close(self) -> None:
+        self.flush()
+
+    def __schedule(self) -> None:
+        with self.lock:
+            if self.timer is not None: return None
+            self.timer = threading.Timer(self.delay, self.flush)
+            self.timer.daemon = True
+            self.timer.start()
+
+    def __stat(self) -> tuple:
+        st = os.stat(self.path)
+        return (st.st_mtime_ns, st.st_size)
+
+    def __load(self) -> None:
+        stamp = self.__stat()
+        with open(self.path, 'r') as f:
+            data = json.load(f)
+        self.data.clear()
+        self.data.update(data)
+        self.stamp = stamp
+
+    def __apply_pending(self) -> None:
+        for key, value in self.pending.items():
+            if value is DELETED: self.data.pop(key, None)
+            else: self.data[key] = value
+
+    def __update(self, merge: bool = False) -> None:
+        # serialize writers; edits only wait for the snapshot, not the disk
+        with self.write_lock:
+            with self.lock:
+                if merge:
+                    # write-behind only carries our own edits; keep what another process saved since we last read
+                    try:
+                        if self.__stat() != self.stamp:
+                            self.__load()
+                            self.__apply_pending()
+                    except (OSError, ValueError):
+                        pass
+                text = json.dumps(self.data, indent=4)
+                self.pending = {}
+            write_atomic(self.path, text, fsync=True)
+            self.stamp = self.__stat()
 
     def write(self):
         self.__update()
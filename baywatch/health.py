@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from baywatch.cache import write_atomic
+
+from collections import deque
+import json
+import os
+import threading
+import time
+
+
+HEALTH_PATH = os.path.join(os.path.dirname(__file__), 'data/health.json')
+
+
+class MirrorStats(object):
+    """Latency and error history for one mirror"""
+
+    def __init__(self, ewma: float | None = None, samples: list | None = None, successes: int = 0, failures: int = 0, consecutive_failures: int = 0, open_until: float = 0, cooldown: float = 0, max_samples: int = 50) -> None:
+        self.ewma = ewma
+        self.samples = deque(samples or [], maxlen=max_samples)
+        self.successes = successes
+        self.failures = failures
+        self.consecutive_failures = consecutive_failures
+        self.open_until = open_until
+        self.cooldown = cooldown
+
+    @property
+    def error_rate(self) -> float:
+        total = self.successes + self.failures
+        return self.failures / total if total > 0 else 0.0
+
+    def percentile(self, p: float) -> float | None:
+        if len(self.samples) == 0: return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+    def to_dict(self) -> dict:
+        return {
+            'ewma': self.ewma,
+            'samples': list(self.samples),
+            'successes': self.successes,
+            'failures': self.failures,
+            'consecutive_failures': self.consecutive_failures,
+            'open_until': self.open_until,
+            'cooldown': self.cooldown,
+        }
+
+
+class MirrorHealth(object):
+    """Per-mirror latency (EWMA and percentiles), error rates and circuit breaker, persisted as JSON
+
+    A mirror's circuit opens after 'threshold' consecutive failures and stays open for a cooldown that doubles on
+    each further failure (up to 'max_cooldown'). Once the cooldown passes the mirror may be tried again; a success
+    closes the circuit.
+    """
+
+    def __init__(self, path: str | None = HEALTH_PATH, alpha: float = 0.3, threshold: int = 3, cooldown: float = 60, max_cooldown: float = 600) -> None:
+        self.path = path
+        self.alpha = alpha
+        self.threshold = threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.lock = threading.Lock()
+        self.mirrors = {}
+        self.load()
+
+    def load(self) -> None:
+        if self.path is None or not os.path.exists(self.path): return None
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            self.mirrors = {m: MirrorStats(**s) for m, s in data.items()}
+        except (OSError, ValueError, TypeError):
+            self.mirrors = {}
+
+    def save(self) -> bool:
+        """Write stats atomically; returns False if the file could not be written."""
+
+        if self.path is None: return False
+        with self.lock:
+            data = {m: s.to_dict() for m, s in self.mirrors.items()}
+        try:
+            write_atomic(self.path, json.dumps(data))
+            return True
+        except OSError:
+            return False
+
+    def stats(self, mirror: str) -> MirrorStats:
+        with self.lock:
+            return self.mirrors.setdefault(mirror, MirrorStats())
+
+    def record_success(self, mirror: str, elapsed: float) -> None:
+        stats = self.stats(mirror)
+        with self.lock:
+            stats.ewma = elapsed if stats.ewma is None else self.alpha * elapsed + (1 - self.alpha) * stats.ewma
+            stats.samples.append(elapsed)
+            stats.successes += 1
+            stats.consecutive_failures = 0
+            stats.open_until = 0
+            stats.cooldown = 0
+
+    def record_failure(self, mirror: str) -> None:
+        stats = self.stats(mirror)
+        with self.lock:
+            stats.failures += 1
+            stats.consecutive_failures += 1
+            if stats.consecutive_failures >= self.threshold:
+                stats.cooldown = min(self.max_cooldown, stats.cooldown * 2 if stats.cooldown > 0 else self.base_cooldown)
+                stats.open_until = time.time() + stats.cooldown
+
+    def is_available(self, mirror: str) -> bool:
+        """False while the mirror's circuit is open."""
+
+        with self.lock:
+            stats = self.mirrors.get(mirror)
+            return stats is None or stats.open_until <= time.time()
+
+    def ranked(self, mirrors: list[str]) -> list[str]:
+        """Available mirrors, fastest known EWMA first; mirrors without history keep their order after those."""
+
+        available = [m for m in mirrors if self.is_available(m)]
+        with self.lock:
+            known = sorted([m for m in available if m in self.mirrors and self.mirrors[m].ewma is not None], key=lambda m: self.mirrors[m].ewma)
+        return known + [m for m in available if m not in known]
+
+    def best(self, mirrors: list[str]) -> str | None:
+        ranked = self.ranked(mirrors)
+        return ranked[0] if len(ranked) > 0 else None
+
+    def summary(self, mirror: str) -> dict:
+        stats = self.stats(mirror)
+        return {
+            'ewma': stats.ewma,
+            'p50': stats.percentile(50),
+            'p95': stats.percentile(95),
+            'error_rate': stats.error_rate,
+            'open': not self.is_available(mirror),
+        }
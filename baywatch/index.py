@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from baywatch.cache import CACHE_DIR
+from baywatch.results import Result
+
+import os
+import re
+import sqlite3
+import threading
+import time
+
+
+INDEX_DB = os.path.join(CACHE_DIR, 'index.sqlite')
+
+COLUMNS = ('id', 'name', 'info_hash', 'leechers', 'seeders', 'num_files', 'size', 'username', 'added', 'status', 'category', 'imdb')
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS torrents (
+    info_hash TEXT PRIMARY KEY, id TEXT, name TEXT, leechers INTEGER, seeders INTEGER, num_files TEXT, size INTEGER,
+    username TEXT, added INTEGER, status TEXT, category TEXT, imdb TEXT, seen INTEGER DEFAULT 1, last_seen REAL
+);
+CREATE INDEX IF NOT EXISTS torrents_last_seen ON torrents (last_seen);
+"""
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS torrents_fts USING fts5(name, content='torrents', content_rowid='rowid');
+CREATE TRIGGER IF NOT EXISTS torrents_ai AFTER INSERT ON torrents BEGIN
+    INSERT INTO torrents_fts (rowid, name) VALUES (new.rowid, new.name);
+END;
+CREATE TRIGGER IF NOT EXISTS torrents_ad AFTER DELETE ON torrents BEGIN
+    INSERT INTO torrents_fts (torrents_fts, rowid, name) VALUES ('delete', old.rowid, old.name);
+END;
+CREATE TRIGGER IF NOT EXISTS torrents_au AFTER UPDATE OF name ON torrents BEGIN
+    INSERT INTO torrents_fts (torrents_fts, rowid, name) VALUES ('delete', old.rowid, old.name);
+    INSERT INTO torrents_fts (rowid, name) VALUES (new.rowid, new.name);
+END;
+"""
+
+
+class LocalIndex(object):
+    """sqlite full-text index of every result seen, for instant offline search
+
+    Rows not seen for 'max_age' seconds are dropped; beyond 'max_rows' the least often and least recently seen rows
+    are evicted first. Falls back to LIKE matching when sqlite lacks FTS5.
+    """
+
+    def __init__(self, path: str = INDEX_DB, max_rows: int = 50000, max_age: float = 90 * 86400) -> None:
+        self.path = path
+        self.max_rows = max_rows
+        self.max_age = max_age
+        self.lock = threading.Lock()
+
+        if path != ':memory:': os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        with self.lock, self.db:
+            self.db.executescript(SCHEMA)
+            try:
+                self.db.executescript(FTS_SCHEMA)
+                self.fts = True
+            except sqlite3.OperationalError:
+                self.fts = False
+
+    def add(self, results: list[Result]) -> None:
+        """Insert or refresh results, then evict by age and size."""
+
+        now = time.time()
+        rows = [
+            (r.info_hash, r.id, r.name, int(r.leechers), int(r.seeders), r.raw_num_files, r.size_bytes, r.username, r.timestamp, r.status, r.category, r.imdb, now)
+            for r in results if r is not None
+        ]
+        if len(rows) == 0: return None
+        with self.lock, self.db:
+            self.db.executemany(
+                'INSERT INTO torrents (info_hash, id, name, leechers, seeders, num_files, size, username, added, status, category, imdb, last_seen) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT (info_hash) DO UPDATE SET '
+                'id = excluded.id, name = excluded.name, leechers = excluded.leechers, seeders = excluded.seeders, '
+                'seen = seen + 1, last_seen = excluded.last_seen',
+                rows,
+            )
+            self.db.execute('DELETE FROM torrents WHERE last_seen < ?', (now - self.max_age,))
+            excess = self.db.execute('SELECT COUNT(*) FROM torrents').fetchone()[0] - self.max_rows
+            if excess > 0:
+                self.db.execute('DELETE FROM torrents WHERE rowid IN (SELECT rowid FROM torrents ORDER BY seen, last_seen LIMIT ?)', (excess,))
+
+    def search(self, query: str, limit: int = 100, announce: str = '', category_names: dict | None = None) -> list[Result]:
+        """Return indexed results whose name matches every word of 'query' (as prefixes), most seeded first."""
+
+        tokens = re.findall(r'\w+', query.lower())
+        if len(tokens) == 0: return []
+        columns = ', '.join('t.{}'.format(c) for c in COLUMNS)
+        with self.lock:
+            if self.fts:
+                match = ' '.join('"{}"*'.format(t) for t in tokens)
+                rows = self.db.execute(
+                    'SELECT {} FROM torrents_fts f JOIN torrents t ON t.rowid = f.rowid WHERE torrents_fts MATCH ? ORDER BY t.seeders DESC LIMIT ?'.format(columns),
+                    (match, limit),
+                ).fetchall()
+            else:
+                where = ' AND '.join(['t.name LIKE ?'] * len(tokens))
+                rows = self.db.execute(
+                    'SELECT {} FROM torrents t WHERE {} ORDER BY t.seeders DESC LIMIT ?'.format(columns, where),
+                    ['%{}%'.format(t) for t in tokens] + [limit],
+                ).fetchall()
+        return [Result({c: str(v) if v is not None else '' for c, v in zip(COLUMNS, row)}, announce, category_names) for row in rows]
+
+    def count(self) -> int:
+        with self.lock:
+            return self.db.execute('SELECT COUNT(*) FROM torrents').fetchone()[0]
+
+    def close(self) -> None:
+        with self.lock:
+            self.db.close()
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from baywatch.async_bay import AsyncBay
+
+import asyncio
+
+
+class Prefetcher(object):
+    """Fetch file lists and descriptions for results around the focused one in the background"""
+
+    def __init__(self, client: AsyncBay, concurrency: int = 2, radius: int = 2) -> None:
+        self.client = client
+        self.radius = radius
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.tasks = {}
+
+    def focus(self, ids: list[str], idx: int, offset: int = 0) -> None:
+        """Prefetch details for the result at 'idx' and its neighbours; cancel pending fetches outside that window.
+
+        'ids' may be a slice of the result ids starting at position 'offset', as long as it covers the window.
+        """
+
+        idx -= offset
+        window = [str(i) for i in ids[max(0, idx - self.radius):idx + self.radius + 1]]
+        for key in list(self.tasks):
+            if key[1] not in window: self.tasks.pop(key).cancel()
+        # files first so an 'f' press never queues behind a description
+        for kind in ('files', 'descr'):
+            for id_no in window:
+                if (kind, id_no) not in self.tasks:
+                    self.tasks[(kind, id_no)] = asyncio.ensure_future(self.fetch(kind, id_no))
+
+    def cancel_all(self) -> None:
+        for task in self.tasks.values():
+            task.cancel()
+        self.tasks.clear()
+
+    async def fetch(self, kind: str, id_no: str) -> None:
+        method = self.client.filenames if kind == 'files' else self.client.description
+        async with self.semaphore:
+            try:
+                await method(id_no)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # failed prefetch is retried on demand
+                self.tasks.pop((kind, id_no), None)
+
+    async def filenames(self, id_no: str | int) -> list:
+        """Return file list, waiting on an in-flight prefetch instead of issuing a duplicate request."""
+
+        task = self.tasks.get(('files', str(id_no)))
+        if task is not None and not task.done():
+            await asyncio.wait([task])
+        return await self.client.filenames(id_no)
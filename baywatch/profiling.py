@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from collections import Counter
+from types import FrameType
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+HANDLER_PREFIXES = ('action_', 'handle_', 'on_', 'watch_')
+ENTRY_FILES = ('cli.py', 'profiling.py')
+
+
+def frame_key(frame: FrameType) -> tuple[str, int, str]:
+    code = frame.f_code
+    return code.co_filename, code.co_firstlineno, code.co_name
+
+
+def describe(key: tuple[str, int, str]) -> str:
+    filename, lineno, name = key
+    return '{} ({}:{})'.format(name, os.path.relpath(filename, os.path.dirname(PACKAGE_DIR)) if filename.startswith(PACKAGE_DIR) else os.path.basename(filename), lineno)
+
+
+def handler_name(stack: traceback.StackSummary) -> str:
+    """Name the handler a blocked stack belongs to: the innermost action_/handle_/on_/watch_ method, else the innermost app frame."""
+
+    app_frames = [f for f in stack if f.filename.startswith(PACKAGE_DIR) and os.path.basename(f.filename) not in ENTRY_FILES]
+    for frame in reversed(app_frames):
+        if frame.name.startswith(HANDLER_PREFIXES): return frame.name
+    return app_frames[-1].name if len(app_frames) > 0 else '<textual>'
+
+
+class Profiler(object):
+    """Event-loop lag watchdog and sampling profiler for one session
+
+    A heartbeat coroutine wakes every 'interval' seconds and records how late it ran. A watchdog thread notices when
+    the heartbeat is more than 'threshold' seconds overdue and captures the stack of the blocked loop thread; the
+    stall's duration is filled in when the loop resumes. A sampler thread records the loop thread's stack every
+    'sample_interval' seconds, counting time spent idle in the selector separately.
+    """
+
+    def __init__(self, threshold: float = 0.1, interval: float = 0.02, sample_interval: float = 0.005) -> None:
+        self.threshold = threshold
+        self.interval = interval
+        self.sample_interval = sample_interval
+        self.loop_thread = None
+        self.heartbeat_task = None
+        self.beat = None
+        self.lags = []
+        self.stalls = []
+        self.pending = None
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.self_samples = Counter()
+        self.total_samples = Counter()
+        self.samples = 0
+        self.idle_samples = 0
+        self.started = None
+        self.elapsed = None
+
+    def start(self) -> None:
+        """Start profiling the running event loop; call from a coroutine on that loop."""
+
+        self.loop_thread = threading.get_ident()
+        self.started = time.perf_counter()
+        self.beat = self.started
+        self.heartbeat_task = asyncio.ensure_future(self.heartbeat())
+        threading.Thread(target=self.watch, name='profiler-watchdog', daemon=True).start()
+        threading.Thread(target=self.sample, name='profiler-sampler', daemon=True).start()
+
+    def stop(self) -> None:
+        if self.stopped.is_set(): return None
+        self.stopped.set()
+        self.elapsed = time.perf_counter() - self.started if self.started is not None else 0
+        if self.heartbeat_task is not None: self.heartbeat_task.cancel()
+
+    async def heartbeat(self) -> None:
+        while not self.stopped.is_set():
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            lag = max(0.0, now - expected)
+            with self.lock:
+                self.beat = now
+                self.lags.append(lag)
+                stall, self.pending = self.pending, None
+            # the watchdog may race a heartbeat that was only just late
+            if stall is not None and lag >= self.threshold:
+                stall['lag'] = lag
+                self.stalls.append(stall)
+
+    def watch(self) -> None:
+        while not self.stopped.wait(self.interval / 2):
+            with self.lock:
+                if self.pending is not None or time.perf_counter() - self.beat < self.interval + self.threshold: continue
+            frame = sys._current_frames().get(self.loop_thread)
+            if frame is None: continue
+            stack = traceback.extract_stack(frame)
+            with self.lock:
+                self.pending = {'handler': handler_name(stack), 'stack': stack, 'lag': None}
+
+    def sample(self) -> None:
+        while not self.stopped.wait(self.sample_interval):
+            frame = sys._current_frames().get(self.loop_thread)
+            if frame is None: continue
+            self.samples += 1
+            if frame.f_code.co_name == 'select' and frame.f_code.co_filename.endswith('selectors.py'):
+                self.idle_samples += 1
+                continue
+            self.self_samples[frame_key(frame)] += 1
+            seen = set()
+            while frame is not None:
+                key = frame_key(frame)
+                if key not in seen:
+                    self.total_samples[key] += 1
+                    seen.add(key)
+                frame = frame.f_back
+
+    def report(self, top: int = 15, stack_depth: int = 6) -> str:
+        """Text report: event-loop lag, hottest functions on the loop thread and worst stall per handler."""
+
+        lags = sorted(self.lags)
+        lines = ['baywatch profile: {:.1f} sec, {} loop samples ({:.0%} idle)'.format(self.elapsed or 0, self.samples, self.idle_samples / self.samples if self.samples > 0 else 0)]
+        if len(lags) > 0:
+            lines.append('event loop lag: p50 {:.1f} ms, p99 {:.1f} ms, max {:.1f} ms; {} stalls over {:.0f} ms'.format(
+                lags[len(lags) // 2] * 1000, lags[min(len(lags) - 1, int(len(lags) * 0.99))] * 1000, lags[-1] * 1000, len(self.stalls), self.threshold * 1000))
+
+        busy = self.samples - self.idle_samples
+        if busy > 0:
+            lines.extend(['', 'hottest functions on the event loop (self / total, % of busy samples):'])
+            for key, count in self.self_samples.most_common(top):
+                lines.append('  {:5.1%} {:5.1%}  {}'.format(count / busy, self.total_samples[key] / busy, describe(key)))
+            lines.extend(['', 'baywatch functions including callees:'])
+            app_keys = [(key, count) for key, count in self.total_samples.most_common() if key[0].startswith(PACKAGE_DIR) and os.path.basename(key[0]) not in ENTRY_FILES]
+            for key, count in app_keys[:top]:
+                lines.append('  {:5.1%}  {}'.format(count / busy, describe(key)))
+
+        if len(self.stalls) > 0:
+            lines.extend(['', 'worst stalls per handler:'])
+            handlers = {}
+            for stall in self.stalls:
+                handlers.setdefault(stall['handler'], []).append(stall)
+            for handler, stalls in sorted(handlers.items(), key=lambda h: -max(s['lag'] for s in h[1])):
+                worst = max(stalls, key=lambda s: s['lag'])
+                lines.append('  {}: {} stalls, worst {:.0f} ms, total {:.0f} ms, blocked in:'.format(handler, len(stalls), worst['lag'] * 1000, sum(s['lag'] for s in stalls) * 1000))
+                for frame in worst['stack'][-stack_depth:]:
+                    lines.append('    {}:{} {}'.format(os.path.basename(frame.filename), frame.lineno, frame.name))
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import urllib.parse
+from array import array
+from datetime import datetime
+from typing import Iterable, Iterator
+import json
+import re
+
+
+FIELDS = ('id', 'name', 'info_hash', 'leechers', 'seeders', 'num_files', 'size', 'username', 'added', 'status', 'category', 'imdb')
+COMPUTED = ('magnet', 'category_name')
+SIZE_UNITS = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+SORT_KEYS = ('seeders', 'leechers', 'size', 'added')
+FILTER_PATTERN = re.compile(r'(?:^|\s)(seeders|size|after|before|cat)(>=|<=|>|<|:)(\S+)', re.IGNORECASE)
+
+
+def filesize_readable(num: int | float | str, suffix: str = 'B') -> str:
+    """Return human-readable filesize from bytes."""
+
+    num = int(num)
+    for unit in ['','K','M','G','T','P','E','Z']:
+        if abs(num) < 1024.0:
+            return "%3.1f %s%s" % (num, unit, suffix)
+        num /= 1024.0
+    return "%.1f %s%s" % (num, 'Yi', suffix)
+
+
+def parse_size(text: str) -> int:
+    """Parse sizes like '700M' or '1.5GB' into bytes (binary units, as shown by filesize_readable)."""
+
+    match = re.fullmatch(r'([0-9.]+)\s*([KMGT]?)(?:I?B)?', text.strip().upper())
+    if match is None: raise ValueError('invalid size: {!r}'.format(text))
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2)])
+
+
+def parse_filters(query: str, category_ids: dict | None = None) -> tuple[str, dict]:
+    """Split filter terms out of a search query, returning (query text, filters for ResultTable.filter).
+
+    Terms: seeders>N, size>700M, size<2G, after:YYYY-MM-DD, before:YYYY-MM-DD, cat:<category>. Terms that do not
+    parse are left in the query text.
+    """
+
+    filters = {}
+
+    def take(match: re.Match) -> str:
+        field, op, value = match.group(1).lower(), match.group(2), match.group(3)
+        try:
+            if field == 'seeders' and op in ('>', '>='):
+                filters['min_seeders'] = int(value) + (1 if op == '>' else 0)
+            elif field == 'size' and op in ('>', '>='):
+                filters['min_size'] = parse_size(value)
+            elif field == 'size' and op in ('<', '<='):
+                filters['max_size'] = parse_size(value)
+            elif field == 'after' and op == ':':
+                filters['since'] = int(datetime.strptime(value, '%Y-%m-%d').timestamp())
+            elif field == 'before' and op == ':':
+                filters['until'] = int(datetime.strptime(value, '%Y-%m-%d').timestamp())
+            elif field == 'cat' and op == ':' and category_ids is not None and value.lower() in category_ids:
+                filters['category'] = int(category_ids[value.lower()])
+            else:
+                return match.group(0)
+        except ValueError:
+            return match.group(0)
+        return ' '
+
+    text = FILTER_PATTERN.sub(take, query)
+    return ' '.join(text.split()), filters
+
+
+def iter_json_array(chunks: Iterable[str]) -> Iterator[object]:
+    """Incrementally decode the items of a top-level JSON array of objects from text chunks.
+
+    Each item is yielded as soon as its closing brace has arrived; raises ValueError on malformed or truncated input.
+    """
+
+    decoder = json.JSONDecoder()
+    buffer = ''
+    started = False
+    for chunk in chunks:
+        buffer += chunk
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                pos += 1
+            if pos >= len(buffer): break
+            if not started:
+                if buffer[pos] != '[': raise ValueError('expected JSON array')
+                started = True
+                pos += 1
+                continue
+            if buffer[pos] == ']': return
+            try:
+                item, pos = decoder.raw_decode(buffer, pos)
+            except ValueError:
+                # incomplete item, wait for more data
+                break
+            yield item
+        buffer = buffer[pos:]
+    raise ValueError('truncated JSON array')
+
+
+class Result(object):
+    """Search result record holding raw apibay fields; display values are computed on first access and memoized.
+
+    Supports item access (result['magnet']) so it can stand in for the formatted dicts used previously.
+    """
+
+    __slots__ = (
+        'id', 'name', 'info_hash', 'leechers', 'seeders', 'raw_num_files', 'size_bytes', 'username', 'timestamp', 'status', 'category', 'imdb',
+        'announce', 'category_names', '_magnet', '_size', '_added',
+    )
+
+    def __init__(self, data: dict, announce: str = '', category_names: dict | None = None) -> None:
+        self.id = data['id']
+        self.name = data['name']
+        self.info_hash = data['info_hash']
+        self.leechers = data['leechers']
+        self.seeders = data['seeders']
+        self.raw_num_files = data['num_files']
+        self.size_bytes = int(data['size'])
+        self.username = data['username']
+        self.timestamp = int(data['added'])
+        self.status = data['status']
+        self.category = data['category']
+        self.imdb = data.get('imdb')
+        self.announce = announce
+        self.category_names = {} if category_names is None else category_names
+        self._magnet = None
+        self._size = None
+        self._added = None
+
+    def __repr__(self) -> str:
+        return 'Result(id={!r}, name={!r})'.format(self.id, self.name)
+
+    def __getitem__(self, key: str) -> object:
+        if key not in FIELDS and key not in COMPUTED: raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in FIELDS or key in COMPUTED
+
+    def get(self, key: str, default: object = None) -> object:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self) -> tuple:
+        return FIELDS + COMPUTED
+
+    @property
+    def magnet(self) -> str:
+        if self._magnet is None:
+            self._magnet = f"magnet:?xt=urn:btih:{self.info_hash}&dn={urllib.parse.quote_plus(self.name)}&{self.announce}"
+        return self._magnet
+
+    @property
+    def size(self) -> str:
+        if self._size is None:
+            self._size = filesize_readable(self.size_bytes)
+        return self._size
+
+    @property
+    def added(self) -> str:
+        if self._added is None:
+            self._added = datetime.strftime(datetime.fromtimestamp(self.timestamp),'%Y-%m-%d %H:%M')
+        return self._added
+
+    @property
+    def num_files(self) -> str:
+        return self.raw_num_files if int(self.raw_num_files) > 0 else '1'
+
+    @property
+    def category_name(self) -> str:
+        return self.category_names.get(int(self.category), 'Unknown')
+
+    def to_dict(self) -> dict:
+        """Return formatted fields as a plain dict."""
+
+        return {k: self[k] for k in self.keys()}
+
+
+class ResultTable(object):
+    """Columnar store of results: numeric arrays for sorting and filtering, Result rows only for display
+
+    Sort and filter work on lists of row indices, so a page can be re-ordered or narrowed without touching the rows
+    or parsing any fields again. Rows are appended only; an info hash already present is not added twice.
+    """
+
+    def __init__(self, results: Iterable[Result] = ()) -> None:
+        self.rows = []
+        self.positions = {}
+        self.columns = {
+            'seeders': array('q'),
+            'leechers': array('q'),
+            'size': array('q'),
+            'added': array('q'),
+            'category': array('l'),
+        }
+        self.extend(results)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def extend(self, results: Iterable[Result]) -> list[int]:
+        """Append results; returns their row indices (existing rows for info hashes already stored)."""
+
+        indices = []
+        columns = self.columns
+        for r in results:
+            if r is None: continue
+            i = self.positions.get(r.info_hash)
+            if i is None:
+                i = self.positions[r.info_hash] = len(self.rows)
+                self.rows.append(r)
+                columns['seeders'].append(int(r.seeders))
+                columns['leechers'].append(int(r.leechers))
+                columns['size'].append(r.size_bytes)
+                columns['added'].append(r.timestamp)
+                columns['category'].append(int(r.category))
+            indices.append(i)
+        return indices
+
+    def filter(self, indices: Iterable[int], min_seeders: int | None = None, min_size: int | None = None, max_size: int | None = None, since: int | None = None, until: int | None = None, category: int | None = None) -> list[int]:
+        """Keep indices whose row passes every given bound; a top-level category (e.g. 200) matches its subcategories
+        and category 0 ('all') matches every row."""
+
+        indices = list(indices)
+        seeders, size, added, categories = (self.columns[c] for c in ('seeders', 'size', 'added', 'category'))
+        if min_seeders is not None: indices = [i for i in indices if seeders[i] >= min_seeders]
+        if min_size is not None: indices = [i for i in indices if size[i] >= min_size]
+        if max_size is not None: indices = [i for i in indices if size[i] <= max_size]
+        if since is not None: indices = [i for i in indices if added[i] >= since]
+        if until is not None: indices = [i for i in indices if added[i] < until]
+        if category is not None and category != 0:
+            if category % 100 == 0:
+                indices = [i for i in indices if categories[i] // 100 == category // 100]
+            else:
+                indices = [i for i in indices if categories[i] == category]
+        return indices
+
+    def sort(self, indices: Iterable[int], key: str, reverse: bool = True) -> list[int]:
+        """Order indices by a numeric column ('seeders', 'leechers', 'size' or 'added'); stable for ties."""
+
+        return sorted(indices, key=self.columns[key].__getitem__, reverse=reverse)
+
+    def take(self, indices: Iterable[int]) -> list[Result]:
+        return [self.rows[i] for i in indices]
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from baywatch.cache import CACHE_DIR, write_atomic
+
+import requests
+from collections import deque
+from contextlib import contextmanager
+from typing import Iterator
+import json
+import os
+import threading
+import time
+
+
+TIMINGS_PATH = os.path.join(CACHE_DIR, 'timings.json')
+PHASES = ('connect', 'ttfb', 'download', 'parse', 'format', 'view', 'paint', 'local', 'search')
+
+
+def nearest_rank(ordered: list[float], p: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+
+class Timings(object):
+    """Durations of request and UI phases, kept per phase as recent samples and summarised as percentiles
+
+    Phases recorded by baywatch:
+      connect   opening a new connection to a mirror
+      ttfb      sending a request until response headers arrive
+      download  reading the response body (streamed searches include incremental parsing)
+      parse     decoding a JSON body
+      format    wrapping API items in Result records
+      view      rebuilding the result view (filter, sort, take)
+      paint     rendering the result list
+      local     submitting a search until matches from the local index and cache are painted
+      search    submitting a search until its network results are painted
+    """
+
+    def __init__(self, path: str | None = TIMINGS_PATH, max_samples: int = 500) -> None:
+        self.path = path
+        self.max_samples = max_samples
+        self.lock = threading.Lock()
+        self.samples = {}
+        self.counts = {}
+
+    def record(self, phase: str, elapsed: float) -> None:
+        with self.lock:
+            self.samples.setdefault(phase, deque(maxlen=self.max_samples)).append(elapsed)
+            self.counts[phase] = self.counts.get(phase, 0) + 1
+
+    @contextmanager
+    def span(self, phase: str) -> Iterator[None]:
+        """Record the time spent in the block as one sample of 'phase'; blocks that raise are not recorded."""
+
+        started = time.perf_counter()
+        yield
+        self.record(phase, time.perf_counter() - started)
+
+    def percentile(self, phase: str, p: float) -> float | None:
+        with self.lock:
+            ordered = sorted(self.samples.get(phase, []))
+        return nearest_rank(ordered, p) if len(ordered) > 0 else None
+
+    def summary(self) -> dict:
+        """Per-phase count, p50, p95, p99 and max in seconds, in PHASES order."""
+
+        with self.lock:
+            samples = {phase: sorted(s) for phase, s in self.samples.items()}
+            counts = dict(self.counts)
+        phases = [p for p in PHASES if p in samples] + sorted(p for p in samples if p not in PHASES)
+        return {
+            phase: {
+                'count': counts[phase],
+                'p50': nearest_rank(samples[phase], 50),
+                'p95': nearest_rank(samples[phase], 95),
+                'p99': nearest_rank(samples[phase], 99),
+                'max': samples[phase][-1],
+            }
+            for phase in phases
+        }
+
+    def save(self) -> bool:
+        """Write the summary atomically as JSON; returns False if the file could not be written."""
+
+        if self.path is None: return False
+        try:
+            write_atomic(self.path, json.dumps({'updated': time.time(), 'phases': self.summary()}, indent=2))
+            return True
+        except OSError:
+            return False
+
+
+class TimedAdapter(requests.adapters.HTTPAdapter):
+    """HTTP adapter that records opening each new pooled connection (TCP and TLS handshake) as a 'connect' span"""
+
+    def __init__(self, timings: Timings, **kwargs) -> None:
+        # HTTPAdapter builds its pool manager in __init__
+        self.timings = timings
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        timings = self.timings
+
+        def timed_pool(pool_cls: type) -> type:
+            connection_cls = pool_cls.ConnectionCls
+
+            def connect(connection) -> None:
+                with timings.span('connect'):
+                    connection_cls.connect(connection)
+
+            return type(pool_cls.__name__, (pool_cls,), {'ConnectionCls': type(connection_cls.__name__, (connection_cls,), {'connect': connect})})
+
+        # the default mapping is shared module state, so replace it rather than update it
+        self.poolmanager.pool_classes_by_scheme = {scheme: timed_pool(cls) for scheme, cls in self.poolmanager.pool_classes_by_scheme.items()}
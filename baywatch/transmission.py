@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Sequence
+import asyncio
+
+
+TRANSFER_FIELDS = ('id', 'name', 'status', 'percentDone', 'rateDownload', 'rateUpload', 'eta')
+STATUS_NAMES = {0: 'stopped', 1: 'check wait', 2: 'checking', 3: 'queued', 4: 'downloading', 5: 'seed wait', 6: 'seeding'}
+
+
+class AsyncTransmission(object):
+    """Awaitable Transmission RPC client over one persistent RPC session.
+
+    Calls run in order on a single worker thread, so the session id negotiated on connect is reused and the event
+    loop never blocks on the daemon. If the daemon is not running it can be launched with 'command'.
+    """
+
+    def __init__(self, username: str | None = None, password: str | None = None, host: str = 'localhost', port: int = 9091, command: str | None = None, try_open: bool = False, timeout: float = 10, launch_wait: float = 5) -> None:
+        self.options = {'username': username, 'password': password, 'host': host, 'port': port, 'timeout': timeout}
+        self.command = command
+        self.try_open = try_open
+        self.launch_wait = launch_wait
+        self.client = None
+        self.error = None
+        self.lock = None
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='transmission')
+
+    async def run(self, method: Callable, *args, **kwargs) -> object:
+        return await asyncio.get_running_loop().run_in_executor(self.executor, partial(method, *args, **kwargs))
+
+    async def connect(self, launch: bool = True) -> bool:
+        """Open the RPC session if needed, launching Transmission once if it is not running; False if unreachable."""
+
+        if self.lock is None: self.lock = asyncio.Lock()
+        async with self.lock:
+            if self.client is not None: return True
+            if await self.try_connect(): return True
+            if not launch or not self.try_open or self.command is None: return False
+
+            import subprocess
+            subprocess.run('{} >/dev/null 2>&1 &'.format(self.command), shell=True)
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.launch_wait
+            delay = 0.25
+            while loop.time() < deadline:
+                await asyncio.sleep(delay)
+                if await self.try_connect(): return True
+                delay = min(delay * 2, 1)
+            return False
+
+    async def try_connect(self) -> bool:
+        try:
+            self.client = await self.run(self.__connect)
+            return True
+        except Exception as e:
+            self.error = e
+            return False
+
+    async def add(self, magnets: dict[str, str]) -> dict[str, list[str]]:
+        """Add magnets keyed by info hash in one batch, skipping torrents Transmission already has.
+
+        Returns info hashes grouped as 'added', 'duplicate' and 'failed'.
+        """
+
+        if not await self.connect(): raise ConnectionError('unable to connect to Transmission: {}'.format(self.error))
+        return await self.call(self.__add, magnets)
+
+    async def get_torrents(self, fields: Sequence[str], recently_active: bool = False) -> list[dict]:
+        """Return only 'fields' of every torrent, or of torrents active in the last minute if 'recently_active'."""
+
+        if not await self.connect(launch=False): raise ConnectionError('unable to connect to Transmission: {}'.format(self.error))
+        return await self.call(self.__get_torrents, fields, 'recently-active' if recently_active else None)
+
+    async def call(self, method: Callable, *args) -> object:
+        try:
+            return await self.run(method, *args)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # session is likely gone; reconnect on next call
+            self.client = None
+            raise
+
+    def __add(self, magnets: dict[str, str]) -> dict[str, list[str]]:
+        existing = {t.hashString.lower() for t in self.client.get_torrents(arguments=['hashString'])}
+        report = {'added': [], 'duplicate': [], 'failed': []}
+        for info_hash, magnet in magnets.items():
+            info_hash = info_hash.lower()
+            if info_hash in existing:
+                report['duplicate'].append(info_hash)
+                continue
+            try:
+                self.client.add_torrent(magnet)
+            except Exception:
+                report['failed'].append(info_hash)
+                continue
+            existing.add(info_hash)
+            report['added'].append(info_hash)
+        return report
+
+    def __connect(self) -> object:
+        # transmission_rpc is only imported once Transmission is actually used
+        from transmission_rpc import Client
+        return Client(**self.options)
+
+    def __get_torrents(self, fields: Sequence[str], ids: str | None) -> list[dict]:
+        return [{f: t.__getattr__(f) for f in fields} for t in self.client.get_torrents(ids=ids, arguments=list(fields))]
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False)
+
+
+class TransferMonitor(object):
+    """Snapshot of Transmission torrents kept current by delta polling
+
+    After one full listing, each poll asks only for 'recently-active' torrents and only for 'fields'. Torrents removed
+    from Transmission are dropped by an id-only listing every 'full_every' polls. Polling runs every 'min_interval'
+    seconds while anything is transferring and backs off to 'max_interval' when idle.
+    """
+
+    def __init__(self, client: AsyncTransmission, fields: Sequence[str] = TRANSFER_FIELDS, min_interval: float = 1, max_interval: float = 10, full_every: int = 10) -> None:
+        self.client = client
+        self.fields = fields
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.full_every = full_every
+        self.interval = min_interval
+        self.torrents = {}
+        self.synced = False
+        self.polls = 0
+        self.error = None
+        self.wakeup = None
+
+    @property
+    def active(self) -> bool:
+        return any(t['rateDownload'] > 0 or t['rateUpload'] > 0 for t in self.torrents.values())
+
+    async def poll(self) -> bool:
+        """Refresh the snapshot; returns True if it changed."""
+
+        changed = False
+        if not self.synced:
+            self.torrents = {t['id']: t for t in await self.client.get_torrents(self.fields)}
+            self.synced = True
+            changed = True
+        else:
+            for t in await self.client.get_torrents(self.fields, recently_active=True):
+                if self.torrents.get(t['id']) != t:
+                    self.torrents[t['id']] = t
+                    changed = True
+            if self.polls % self.full_every == 0:
+                ids = {t['id'] for t in await self.client.get_torrents(('id',))}
+                for removed in self.torrents.keys() - ids:
+                    del self.torrents[removed]
+                    changed = True
+        self.polls += 1
+        self.error = None
+        self.interval = self.min_interval if changed or self.active else min(self.max_interval, self.interval * 2)
+        return changed
+
+    async def watch(self, on_change: Callable[[], None]) -> None:
+        """Poll until cancelled, calling 'on_change' whenever the snapshot or connection state changes."""
+
+        self.wakeup = asyncio.Event()
+        while True:
+            try:
+                if await self.poll(): on_change()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.error = e
+                self.synced = False
+                self.interval = self.max_interval
+                on_change()
+            self.wakeup.clear()
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def wake(self) -> None:
+        """Poll now and at the fastest rate, e.g. after adding torrents."""
+
+        self.interval = self.min_interval
+        if self.wakeup is not None: self.wakeup.set()
@@ -0,0 +1,315 @@
+"""Benchmark suite for baywatch against local fake apibay mirrors.
+
+Run from the repository root:
+
+    python -m benchmarks.bench --output bench.json
+
+Results are emitted as JSON (per benchmark: sample count, mean, p50, p95, min, max in seconds, plus
+throughput where relevant) so runs can be compared between releases.
+"""
+
+from __future__ import annotations
+
+from benchmarks.fake_apibay import start_mirrors
+
+from baywatch.bay import Bay
+from baywatch.version import __version__
+
+import argparse
+import json
+import os
+import platform
+import re
+import select
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), '..', 'baywatch', 'data', 'conf.json')
+# children get their own config and health file; run them with XDG_CACHE_HOME pointed at a scratch directory too
+TUI_CHILD = """
+import sys
+import baywatch.app as app
+import baywatch.bay as bay
+app.CONFIG_PATH = sys.argv[1]
+bay.HEALTH_PATH = sys.argv[3]
+app.Baywatch.run(title='baywatch', log=sys.argv[2])
+"""
+IMPORT_CHILD = """
+import sys, time
+started = time.perf_counter()
+__import__(sys.argv[1])
+print(time.perf_counter() - started)
+"""
+# the baywatch entry point with its config pointed at a local mirror
+STARTUP_CHILD = """
+import sys
+import baywatch.app as app
+import baywatch.bay as bay
+app.CONFIG_PATH = sys.argv.pop(1)
+bay.HEALTH_PATH = sys.argv.pop(1)
+from baywatch.cli import main
+main()
+"""
+
+
+def summarize(samples: list[float], count: int | None = None) -> dict:
+    """Summary statistics for a list of durations (seconds)."""
+
+    if len(samples) == 0: return {'n': 0}
+    ordered = sorted(samples)
+    summary = {
+        'n': len(ordered),
+        'mean': sum(ordered) / len(ordered),
+        'p50': ordered[len(ordered) // 2],
+        'p95': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        'min': ordered[0],
+        'max': ordered[-1],
+    }
+    if count is not None: summary['per_sec'] = count / sum(ordered) if sum(ordered) > 0 else None
+    return summary
+
+
+def timed(fn, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def new_client(proxy_list: str, mirror: str | None, **kwargs) -> Bay:
+    """Uncached client so every call reaches the fake mirror."""
+
+    return Bay(mirror, mirror_list_url=proxy_list + '/list.txt', cache_size=0, details_cache_size=0, **kwargs)
+
+
+def bench_mirror_selection(proxy_list: str, dead_mirror: str, repeat: int) -> dict:
+    """Bay.__init__ when the configured mirror is down and a sweep is needed"""
+
+    samples = timed(lambda: new_client(proxy_list, dead_mirror).close(), repeat)
+    return summarize(samples)
+
+
+def bench_mirror_responses(client: Bay, repeat: int) -> dict:
+    samples = timed(lambda: client.get_mirror_responses(), repeat)
+    return summarize(samples)
+
+
+def bench_search(client: Bay, repeat: int) -> dict:
+    """Bay.search round-trip including result formatting"""
+
+    queries = iter(range(repeat))
+    samples = timed(lambda: client.search('bench {}'.format(next(queries))), repeat)
+    return summarize(samples, count=repeat)
+
+
+def bench_format(client: Bay, payload: list, repeat: int) -> dict:
+    """__format_results alone, with every display field materialized as the UI and clipboard would"""
+
+    def format_page():
+        for r in client._Bay__format_results([dict(p) for p in payload]):
+            r.magnet, r.size, r.added, r.category_name
+    samples = timed(format_page, repeat)
+    return summarize(samples, count=repeat * len(payload))
+
+
+def bench_filenames(client: Bay, repeat: int) -> dict:
+    ids = iter(range(repeat))
+    samples = timed(lambda: client.filenames(next(ids)), repeat)
+    return summarize(samples, count=repeat)
+
+
+def bench_action_submit(mirror: str, repeat: int, timeout: float = 30) -> dict:
+    """End-to-end search-to-paint through Baywatch.action_submit, driven over a pseudo-terminal"""
+
+    import pty
+
+    tmp = tempfile.mkdtemp(prefix='baywatch-bench-')
+    env = dict(os.environ, XDG_CACHE_HOME=os.path.join(tmp, 'cache'), TERM='xterm-256color')
+    conf_path = os.path.join(tmp, 'conf.json')
+    log_path = os.path.join(tmp, 'bench.log')
+    health_path = os.path.join(tmp, 'health.json')
+    with open(CONFIG_PATH, 'r') as f:
+        conf = json.load(f)
+    conf['mirror'] = mirror
+    conf.setdefault('cache', {})['disk'] = False
+    # measure the network path of an explicit submit only
+    conf.setdefault('index', {})['enabled'] = False
+    conf.setdefault('live_search', {})['enabled'] = False
+    with open(conf_path, 'w') as f:
+        json.dump(conf, f)
+
+    pid, fd = pty.fork()
+    if pid == 0:
+        os.execvpe(sys.executable, [sys.executable, '-c', TUI_CHILD, conf_path, log_path, health_path], env)
+
+    def drain(seconds: float) -> None:
+        end = time.time() + seconds
+        while time.time() < end:
+            if select.select([fd], [], [], 0.01)[0]:
+                try:
+                    os.read(fd, 1 << 16)
+                except OSError:
+                    return
+
+    def wait_for(pattern: str, count: int) -> list[str]:
+        end = time.time() + timeout
+        while time.time() < end:
+            drain(0.02)
+            if os.path.exists(log_path):
+                with open(log_path, 'r') as f:
+                    matches = re.findall(pattern, f.read())
+                if len(matches) >= count: return matches
+        raise TimeoutError('timed out waiting for {!r}'.format(pattern))
+
+    painted = r'painted ([0-9.]+) sec after search'
+    wall = []
+    try:
+        first_frame = float(wait_for(r'first frame after ([0-9.]+) sec', 1)[0])
+        wait_for(r'connected to', 1)
+        os.write(fd, b'\t')
+        query = ''
+        for i in range(repeat):
+            os.write(fd, b'\x7f' * len(query))
+            query = 'bench{}'.format(i)
+            os.write(fd, query.encode())
+            drain(0.05)
+            start = time.perf_counter()
+            os.write(fd, b'\r')
+            wait_for(painted, i + 1)
+            wall.append(time.perf_counter() - start)
+        samples = [float(m) for m in wait_for(painted, repeat)]
+    finally:
+        os.kill(pid, signal.SIGTERM)
+        os.waitpid(pid, 0)
+        os.close(fd)
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    return {'first_frame': first_frame, 'search_to_paint': summarize(samples), 'keypress_to_paint': summarize(wall)}
+
+
+def bench_startup(mirror: str, repeat: int, timeout: float = 30) -> dict:
+    """Cold-process import time per module and launch-to-first-paint time per entry point
+
+    Every sample is a fresh interpreter. The first launch of the app starts with an empty title cache, so it is
+    reported separately as 'cold'.
+    """
+
+    import pty
+
+    tmp = tempfile.mkdtemp(prefix='baywatch-bench-')
+    env = dict(os.environ, XDG_CACHE_HOME=os.path.join(tmp, 'cache'), TERM='xterm-256color')
+    conf_path = os.path.join(tmp, 'conf.json')
+    with open(CONFIG_PATH, 'r') as f:
+        conf = json.load(f)
+    conf['mirror'] = mirror
+    with open(conf_path, 'w') as f:
+        json.dump(conf, f)
+    # text each entry point paints once its first frame is on screen
+    entry_points = {
+        'app': (['-c', STARTUP_CHILD, conf_path, os.path.join(tmp, 'health.json')], b'Mirror info'),
+        'config': (['-m', 'baywatch.cli', '-c'], b'Configuration'),
+    }
+    report = {'import': {}, 'version': None, 'first_paint': {}}
+    try:
+        for module in ('baywatch.cli', 'baywatch.config_control', 'baywatch.app'):
+            samples = []
+            for _ in range(repeat):
+                out = subprocess.run([sys.executable, '-c', IMPORT_CHILD, module], env=env, check=True, capture_output=True, text=True)
+                samples.append(float(out.stdout))
+            report['import'][module] = summarize(samples)
+
+        report['version'] = summarize(timed(
+            lambda: subprocess.run([sys.executable, '-m', 'baywatch.cli', '-v'], env=env, check=True, capture_output=True), repeat
+        ))
+
+        for name, (argv, marker) in entry_points.items():
+            samples = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                pid, fd = pty.fork()
+                if pid == 0:
+                    os.execvpe(sys.executable, [sys.executable] + argv, env)
+                output = b''
+                try:
+                    while marker not in output:
+                        if time.perf_counter() - started > timeout: raise TimeoutError('{} did not paint'.format(name))
+                        if select.select([fd], [], [], 0.01)[0]: output += os.read(fd, 1 << 16)
+                    samples.append(time.perf_counter() - started)
+                finally:
+                    os.kill(pid, signal.SIGTERM)
+                    os.waitpid(pid, 0)
+                    os.close(fd)
+            report['first_paint'][name] = {'cold': samples[0], 'warm': summarize(samples[1:])}
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return report
+
+
+def parse() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='baywatch benchmarks against local fake mirrors')
+    parser.add_argument('--healthy', type=int, default=4, help='healthy mirrors')
+    parser.add_argument('--slow', type=int, default=2, help='mirrors that hang past the timeout')
+    parser.add_argument('--failing', type=int, default=2, help='mirrors that always answer 503')
+    parser.add_argument('--latency', type=float, default=0.02, help='base latency of healthy mirrors (sec)')
+    parser.add_argument('--jitter', type=float, default=0.01, help='random extra latency (sec)')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='fraction of requests healthy mirrors fail')
+    parser.add_argument('--results', type=int, default=100, help='results per search page')
+    parser.add_argument('--files', type=int, default=10, help='files per torrent')
+    parser.add_argument('--repeat', type=int, default=20, help='samples per benchmark')
+    parser.add_argument('--skip-tui', action='store_true', help='skip end-to-end TUI benchmark')
+    parser.add_argument('--skip-startup', action='store_true', help='skip startup benchmark')
+    parser.add_argument('-o', '--output', help='write JSON results to file instead of stdout')
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse()
+    proxy_list, mirrors = start_mirrors(
+        healthy=args.healthy, slow=args.slow, failing=args.failing, latency=args.latency, jitter=args.jitter,
+        failure_rate=args.failure_rate, results=args.results, files=args.files,
+    )
+    fastest = mirrors[0]
+    dead = mirrors[-1].url if args.failing > 0 else 'http://127.0.0.1:9'
+
+    client = new_client(proxy_list.url, fastest.url)
+    payload = fastest.search_results('format', '0')
+
+    report = {
+        'version': __version__,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.time(),
+        'params': vars(args),
+        'benchmarks': {
+            'mirror_selection': bench_mirror_selection(proxy_list.url, dead, max(1, args.repeat // 4)),
+            'get_mirror_responses': bench_mirror_responses(client, max(1, args.repeat // 4)),
+            'search': bench_search(client, args.repeat),
+            'format_results': bench_format(client, payload, args.repeat),
+            'filenames': bench_filenames(client, args.repeat),
+        },
+    }
+    if not args.skip_tui and os.name == 'posix':
+        report['benchmarks']['action_submit'] = bench_action_submit(fastest.url, args.repeat)
+    if not args.skip_startup and os.name == 'posix':
+        report['benchmarks']['startup'] = bench_startup(fastest.url, max(2, args.repeat // 4))
+
+    client.close()
+    for m in mirrors + [proxy_list]: m.stop()
+
+    output = json.dumps(report, indent=2)
+    if args.output is None:
+        print(output)
+    else:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+
+
+if __name__ == '__main__':
+    main()
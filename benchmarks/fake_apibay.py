@@ -0,0 +1,145 @@
+"""Local stand-in for an apibay mirror with configurable latency, failure rate and payload size."""
+
+from __future__ import annotations
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import urllib.parse
+import threading
+import random
+import json
+import time
+
+
+class FakeApibayHandler(BaseHTTPRequestHandler):
+    """Serves /apibay/q.php, /apibay/f.php, /apibay/t.php, /list.txt and / (mirror probe)"""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        fake = self.server.fake
+        fake.count()
+        url = urllib.parse.urlsplit(self.path)
+        params = dict(urllib.parse.parse_qsl(url.query))
+
+        fake.delay()
+        if fake.should_fail():
+            return self.respond(503, b'unavailable', 'text/plain')
+
+        if url.path == '/apibay/q.php':
+            body = json.dumps(fake.search_results(params.get('q', ''), params.get('cat', '0')))
+        elif url.path == '/apibay/f.php':
+            body = json.dumps(fake.file_list(params.get('id', '0')))
+        elif url.path == '/apibay/t.php':
+            body = json.dumps({'id': params.get('id', '0'), 'descr': 'description ' * 20})
+        elif url.path == '/list.txt':
+            return self.respond(200, fake.mirror_list().encode(), 'text/plain')
+        elif url.path == '/':
+            return self.respond(200, b'<html>fake apibay</html>', 'text/html')
+        else:
+            return self.respond(404, b'not found', 'text/plain')
+        self.respond(200, body.encode(), 'application/json')
+
+    def respond(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # client went away, e.g. a benchmarked process was stopped
+            pass
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class FakeApibay(object):
+    """Threaded HTTP server impersonating one apibay mirror"""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, failure_rate: float = 0.0, results: int = 100, files: int = 10, host: str = '127.0.0.1', port: int = 0, seed: int | None = None) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.results = results
+        self.files = files
+        self.mirrors = []
+        self.requests = 0
+        self.lock = threading.Lock()
+        self.random = random.Random(seed)
+
+        self.server = ThreadingHTTPServer((host, port), FakeApibayHandler)
+        self.server.daemon_threads = True
+        self.server.fake = self
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return 'http://{}:{}'.format(host, port)
+
+    def start(self) -> str:
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self.url
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def count(self) -> None:
+        with self.lock:
+            self.requests += 1
+
+    def delay(self) -> None:
+        with self.lock:
+            delay = self.latency + self.random.uniform(0, self.jitter)
+        if delay > 0: time.sleep(delay)
+
+    def should_fail(self) -> bool:
+        with self.lock:
+            return self.random.random() < self.failure_rate
+
+    def mirror_list(self) -> str:
+        """proxy-bay list.txt format: three header lines, then one mirror per line"""
+        return '\n'.join(['# fake proxy list', '#', '#'] + self.mirrors) + '\n'
+
+    def search_results(self, query: str, category: str) -> list:
+        if self.results == 0:
+            return [{'id': '0', 'name': 'No results returned', 'info_hash': '0' * 40, 'leechers': '0', 'seeders': '0', 'num_files': '0', 'size': '0', 'username': '', 'added': '0', 'status': 'member', 'category': '0', 'imdb': ''}]
+        now = int(time.time())
+        return [
+            {
+                'id': str(100000 + i),
+                'name': '{} {} 1080p x264-{}'.format(query or 'result', i, category),
+                'info_hash': '{:040X}'.format(hash((query, i)) & (16 ** 40 - 1)),
+                'leechers': str(i * 3 % 97),
+                'seeders': str(1000 - i),
+                'num_files': str(i % 20),
+                'size': str(1024 ** 2 * (i + 1) * 37),
+                'username': 'uploader{}'.format(i % 7),
+                'added': str(now - i * 3600),
+                'status': ('vip', 'trusted', 'member')[i % 3],
+                'category': ('201', '205', '101', '303')[i % 4],
+                'imdb': '',
+            }
+            for i in range(self.results)
+        ]
+
+    def file_list(self, id_no: str) -> list:
+        return [{'name': ['file_{}_{}.mkv'.format(id_no, i)], 'size': [1024 ** 2 * (i + 1)]} for i in range(max(1, self.files))]
+
+
+def start_mirrors(healthy: int = 4, slow: int = 2, failing: int = 2, latency: float = 0.02, jitter: float = 0.01, failure_rate: float = 0.0, results: int = 100, files: int = 10, slow_latency: float = 10.0) -> tuple[FakeApibay, list[FakeApibay]]:
+    """Start a proxy-list server plus healthy, hanging and always-failing mirrors; returns (list server, mirrors)."""
+
+    mirrors = [FakeApibay(latency=latency * (i + 1), jitter=jitter, failure_rate=failure_rate, results=results, files=files, seed=i) for i in range(healthy)]
+    mirrors += [FakeApibay(latency=slow_latency) for _ in range(slow)]
+    mirrors += [FakeApibay(failure_rate=1.0) for _ in range(failing)]
+    for m in mirrors: m.start()
+
+    proxy_list = FakeApibay()
+    proxy_list.mirrors = [m.url for m in reversed(mirrors)]
+    proxy_list.start()
+    return proxy_list, mirrors